@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fetch and format VAPI call transcripts.
+
+Runs inside the project virtual environment (where the VAPI SDK is
+installed) and prints the formatted transcripts to stdout. Invoked by
+vapi_transcripts.py as:
+
+    venv/bin/python _vapi_fetch.py --assistant-id <uuid> [filters]
+
+The API key is read from the VAPI_API_KEY environment variable so it
+never appears on a command line or in a temp file.
+"""
+
+import argparse
+import os
+import sys
+import traceback
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Any, Optional
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Returns:
+        Namespace object containing parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Fetch and format VAPI call transcripts"
+    )
+    parser.add_argument("--assistant-id", required=True,
+                        help="VAPI assistant ID to fetch transcripts for")
+    parser.add_argument("--min-duration", type=int, default=0,
+                        help="Minimum call duration in seconds")
+    parser.add_argument("--days-ago", type=int, default=None,
+                        help="Only include calls from the last N days")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Maximum number of calls to include")
+    parser.add_argument("--today-only", action="store_true",
+                        help="Only include calls from today")
+    return parser.parse_args()
+
+
+def parse_call_datetime(value: Any) -> Optional[datetime]:
+    """
+    Normalize a created_at/ended_at value to a datetime.
+
+    Args:
+        value: A datetime, an ISO date string, or None
+
+    Returns:
+        Parsed datetime, or None when the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def sort_by_attr(items: list, attr: str, default: Any) -> list:
+    """
+    Sort items by an attribute, fetching it once per element.
+
+    The decorate-sort pattern keeps the comparisons on plain tuples via
+    itemgetter (C code) instead of invoking a getattr lambda per
+    comparison, which matters on calls with hundreds of messages.
+
+    Args:
+        items: Objects to sort
+        attr: Attribute name to sort by
+        default: Value used when an item lacks the attribute
+
+    Returns:
+        New list sorted by the attribute
+    """
+    keyed = [(getattr(item, attr, default), item) for item in items]
+    keyed.sort(key=itemgetter(0))
+    return [item for _, item in keyed]
+
+
+def build_rows(calls: list) -> list:
+    """
+    Parse each call's dates exactly once.
+
+    Sorting, filtering, and formatting all reuse the cached values, so
+    no pass over the calls re-parses an ISO date string.
+
+    Args:
+        calls: Call objects from the VAPI SDK
+
+    Returns:
+        List of dicts with 'call', 'created', 'ended', and 'sort_key'
+    """
+    rows = []
+    for call in calls:
+        created_raw = getattr(call, "created_at", None) or getattr(call, "createdAt", None)
+        ended_raw = getattr(call, "ended_at", None) or getattr(call, "endedAt", None)
+        created = parse_call_datetime(created_raw)
+        # Timestamp float when parsed, raw string otherwise, matching
+        # the previous fallback ordering
+        if created is not None:
+            sort_key = created.timestamp()
+        else:
+            sort_key = str(created_raw) if created_raw else ""
+        rows.append({
+            'call': call,
+            'created': created,
+            'ended': parse_call_datetime(ended_raw),
+            'sort_key': sort_key,
+        })
+    return rows
+
+
+def compute_cutoff_date(days_ago: Optional[int] = None,
+                        today_only: bool = False) -> Optional[datetime]:
+    """
+    Compute the earliest creation date a call may have.
+
+    Args:
+        days_ago: Only include calls from the last N days
+        today_only: Only include calls from today
+
+    Returns:
+        Cutoff datetime, or None when no date filter applies
+    """
+    now = datetime.now()
+    if days_ago is not None and days_ago > 0:
+        return now - timedelta(days=days_ago)
+    if today_only:
+        return datetime(now.year, now.month, now.day, 0, 0, 0)
+    return None
+
+
+def format_transcripts(calls: list, min_duration: int = 0,
+                       days_ago: Optional[int] = None,
+                       limit: Optional[int] = None,
+                       today_only: bool = False) -> Optional[str]:
+    """
+    Filter, sort, and format a list of calls into a transcript document.
+
+    Args:
+        calls: Call objects from the VAPI SDK
+        min_duration: Minimum duration in seconds for a call to be included
+        days_ago: Only include calls from the last N days
+        limit: Maximum number of calls to include
+        today_only: Only include calls from today
+
+    Returns:
+        Formatted transcript string, or None if no calls match
+    """
+    # Sort rows by creation date (oldest first); dates were parsed
+    # once in build_rows
+    rows = sorted(build_rows(calls), key=lambda row: row['sort_key'])
+
+    # Calculate the cutoff date for filtering; kept client-side as a
+    # safety net even when the server already applied the window
+    cutoff_date = compute_cutoff_date(days_ago, today_only)
+
+    filtered_rows = []
+    for row in rows:
+        # Check duration
+        duration = getattr(row['call'], "duration", 0) or 0
+
+        # Skip if duration is less than minimum
+        if duration < min_duration:
+            continue
+
+        # Check if the call is within the date range
+        if cutoff_date and row['created'] and row['created'] < cutoff_date:
+            continue
+
+        filtered_rows.append(row)
+
+    # Apply limit if specified
+    if limit is not None and limit > 0 and len(filtered_rows) > limit:
+        filtered_rows = filtered_rows[-limit:]  # Take the most recent calls
+
+    if not filtered_rows:
+        return None
+
+    # Build the document as a list of parts joined once at the end;
+    # repeated str += can degrade to quadratic copying on large runs
+    parts = [f"# VAPI Call Transcripts ({len(filtered_rows)} total calls)\n\n",
+             f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"]
+
+    for i, row in enumerate(filtered_rows):
+        call = row['call']
+        call_id = getattr(call, "id", "unknown")
+
+        # Format the dates parsed in build_rows
+        call_start_date = row['created'].strftime('%Y-%m-%d %H:%M:%S') if row['created'] else "Unknown date"
+        call_end_date = row['ended'].strftime('%Y-%m-%d %H:%M:%S') if row['ended'] else "Unknown end time"
+
+        # Get duration (from the attribute, or computed from the
+        # already-parsed datetimes; no format-then-reparse round trip)
+        duration = getattr(call, "duration", 0)
+        if not duration and row['created'] and row['ended']:
+            duration = (row['ended'] - row['created']).total_seconds()
+
+        duration_str = f" ({duration:.0f}s)" if duration else ""
+
+        # Get additional metadata
+        status = getattr(call, "status", "")
+        ended_reason = getattr(call, "ended_reason", "")
+        call_type = getattr(call, "type", "")
+        status_info = f" • Status: {status}" if status else ""
+        reason_info = f" • Ended: {ended_reason}" if ended_reason else ""
+        type_info = f" • Type: {call_type}" if call_type else ""
+
+        # Format header with metadata
+        parts.append(f"# Call {i+1} - {call_start_date}{duration_str} (ID: {call_id})\n")
+        parts.append(f"Start: {call_start_date} • End: {call_end_date}{status_info}{reason_info}{type_info}\n\n")
+
+        # Check for transcript in the artifact first - this is the most reliable source
+        artifact = getattr(call, "artifact", None)
+        transcript_found = False
+
+        if artifact:
+            # Try to get the pre-formatted transcript from the artifact
+            artifact_transcript = getattr(artifact, "transcript", None)
+            if artifact_transcript and isinstance(artifact_transcript, str) and artifact_transcript.strip():
+                transcript_found = True
+                # Clean up the transcript format
+                clean_transcript = artifact_transcript.replace("AI:", "AI: ").replace("User:", "Human: ")
+                parts.append(clean_transcript + "\n\n")
+
+        # If no transcript was found in the artifact, try the messages
+        if not transcript_found and artifact:
+            messages = getattr(artifact, "messages", [])
+            if messages:
+                transcript_found = True
+                # Sort messages by time
+                sorted_messages = sort_by_attr(messages, "time", 0)
+
+                for message in sorted_messages:
+                    role = getattr(message, "role", "")
+                    if role == "system":
+                        # Skip system messages
+                        continue
+
+                    display_role = "AI" if role == "bot" else "Human"
+                    content = getattr(message, "message", "")
+                    if content and content.strip():
+                        parts.append(f"{display_role}: {content}\n\n")
+
+        # If still no transcript, try other approaches
+        if not transcript_found:
+            # Try direct transcript attribute if available
+            transcript = getattr(call, "transcript", None)
+            if transcript:
+                transcript_found = True
+                # Sort transcript entries by creation time
+                sorted_entries = sort_by_attr(transcript, "createdAt", "")
+
+                for entry in sorted_entries:
+                    role = "AI" if getattr(entry, "role", "") == "assistant" else "Human"
+                    content = getattr(entry, "content", "")
+                    if content and content.strip():
+                        parts.append(f"{role}: {content}\n\n")
+
+            # Try the messages attribute directly if still no transcript
+            if not transcript_found:
+                messages = getattr(call, "messages", [])
+                if messages:
+                    transcript_found = True
+                    sorted_messages = sort_by_attr(messages, "createdAt", "")
+
+                    for message in sorted_messages:
+                        role = "AI" if getattr(message, "role", "") == "assistant" else "Human"
+                        content = getattr(message, "content", "")
+                        if content and content.strip():
+                            parts.append(f"{role}: {content}\n\n")
+
+        if not transcript_found:
+            parts.append("No transcript available for this call\n\n")
+
+        parts.append("---\n\n")
+
+    return "".join(parts)
+
+
+def main() -> int:
+    """
+    Main entry point function.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    args = parse_args()
+
+    api_key = os.environ.get('VAPI_API_KEY')
+    if not api_key:
+        print("Error: VAPI_API_KEY environment variable not set", file=sys.stderr)
+        return 1
+
+    try:
+        from vapi import Vapi
+
+        # Initialize VAPI client
+        client = Vapi(token=api_key)
+
+        # Push the date window and limit to the server so pagination
+        # never fetches history the filters would discard anyway
+        list_kwargs = {'assistant_id': args.assistant_id}
+        cutoff_date = compute_cutoff_date(args.days_ago, args.today_only)
+        if cutoff_date is not None:
+            list_kwargs['created_at_gt'] = cutoff_date.isoformat()
+        if args.limit is not None and args.limit > 0:
+            list_kwargs['limit'] = args.limit
+
+        # Fetch calls
+        response = client.calls.list(**list_kwargs)
+        calls = list(response)
+
+        if not calls:
+            print("No calls found")
+            return 0
+
+        result = format_transcripts(calls,
+                                    min_duration=args.min_duration,
+                                    days_ago=args.days_ago,
+                                    limit=args.limit,
+                                    today_only=args.today_only)
+        if result is None:
+            print("No calls match the specified filters")
+            return 0
+
+        # One explicit UTF-8 encode straight to the binary pipe; the
+        # parent decodes once on its side
+        sys.stdout.buffer.write(result.encode('utf-8'))
+        sys.stdout.buffer.flush()
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        print("Traceback:", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,65 +6,56 @@ import sys
 import json
 import traceback
 
-# Load API key from .env file
-API_KEY = None
-env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+# orjson serializes the large call dumps several times faster than
+# stdlib json; fall back silently when it isn't installed
 try:
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.startswith('VAPI_API_KEY='):
-                    API_KEY = line.strip().split('=', 1)[1]
-                    break
-except Exception as e:
-    print(f"Warning: Could not read API key from .env file: {e}")
+    import orjson
 
-if not API_KEY:
-    print("Error: VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
-    sys.exit(1)
+    def dumps_indented(obj):
+        """Serialize obj to indented JSON text"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+except ImportError:
+    def dumps_indented(obj):
+        """Serialize obj to indented JSON text"""
+        return json.dumps(obj, indent=2, default=str)
 
-# Activate virtual environment and import the SDK
-venv_activation = f"source {os.path.dirname(os.path.abspath(__file__))}/venv/bin/activate"
-os.system(venv_activation)
+# Shared preamble: cached .env parse, SDK import check, and client cache
+from vapi_common import get_client, require_api_key
 
-try:
-    from vapi import Vapi
-except ImportError:
-    print("Error: VAPI SDK not found. Make sure to run:")
-    print("cd /Users/christianulstrup/Documents/scripts/vapi-tools && python3 -m venv venv && source venv/bin/activate && pip install vapi_server_sdk")
-    sys.exit(1)
+require_api_key()
 
 def examine_call_object(assistant_id):
     """Examine a call object to understand its structure"""
     try:
-        client = Vapi(token=API_KEY)
+        client = get_client()
         response = client.calls.list(assistant_id=assistant_id)
-        calls = list(response)
-        
-        if not calls:
+
+        # Only the first call is examined, so pull one item from the
+        # paginator instead of materializing every page
+        call = next(iter(response), None)
+
+        if call is None:
             print("No calls found for this assistant ID")
             return
-        
-        call = calls[0]
-        
+
+        # Convert to a plain dict once instead of walking dir(call) and
+        # paying pydantic's descriptor lookup twice per attribute
+        try:
+            call_dict = call.dict()
+        except Exception:
+            call_dict = {k: v for k, v in vars(call).items() if not k.startswith('_')}
+
         # Print all attributes
         print("Call object attributes:")
-        for key in dir(call):
-            if not key.startswith('_'):  # Skip internal attributes
-                try:
-                    value = getattr(call, key)
-                    if not callable(value):  # Skip methods
-                        print(f"{key}: {value}")
-                except:
-                    print(f"{key}: <error getting value>")
-        
+        for key, value in call_dict.items():
+            print(f"{key}: {value}")
+
         # Print dictionary representation if possible
         try:
-            call_dict = call.dict()
             print("\nCall as dictionary:")
-            print(json.dumps(call_dict, indent=2))
+            print(dumps_indented(call_dict))
         except:
-            print("\nCould not convert call to dictionary")
+            print("\nCould not serialize call dictionary")
             traceback.print_exc()
             
         # Check for transcript-related methods
@@ -7,10 +7,14 @@ Script to validate code formatting and conventions.
 
 import os
 import sys
-import importlib.util
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Regexes compiled once at module scope instead of per checked line/file
+IMPORT_RE = re.compile(r'^(?:import |from )')
+TYPE_HINT_RE = re.compile(r'def [a-zA-Z0-9_]+\(.+: [a-zA-Z]+[\[\],\s]*\)')
+
 def check_file_executable(file_path):
     """Check if a Python file is executable."""
     is_executable = os.access(file_path, os.X_OK)
@@ -29,12 +33,12 @@ def check_shebang(file_contents):
 def check_docstring(file_contents):
     """Check if file has a docstring."""
     # Simple check for triple quotes after imports
-    lines = file_contents.split('\n')
+    lines = file_contents.splitlines()
     has_docstring = False
     import_section_passed = False
-    
+
     for i, line in enumerate(lines):
-        if re.match(r'^import |^from ', line):
+        if IMPORT_RE.match(line):
             import_section_passed = True
         elif import_section_passed and line.strip() and not line.startswith('#'):
             if '"""' in line or "'''" in line:
@@ -47,7 +51,7 @@ def check_docstring(file_contents):
 
 def check_type_hints(file_contents):
     """Check for the presence of type hints."""
-    has_type_hints = 'typing' in file_contents or re.search(r'def [a-zA-Z0-9_]+\(.+: [a-zA-Z]+[\[\],\s]*\)', file_contents)
+    has_type_hints = 'typing' in file_contents or TYPE_HINT_RE.search(file_contents)
     if not has_type_hints:
         print(f"⚠️  Warning: File may be missing type hints")
     return has_type_hints
@@ -57,22 +61,25 @@ def validate_python_file(file_path):
     print(f"\nValidating {file_path}...")
     
     with open(file_path, 'r', encoding='utf-8') as f:
-        contents = f.read()
-    
+        # The shebang and docstring checks only look at the top of the
+        # file, so give them just the first 4KB instead of every line
+        head = f.read(4096)
+        contents = head + f.read()
+
     # Run checks
     executable = check_file_executable(file_path)
-    shebang = check_shebang(contents)
-    docstring = check_docstring(contents)
+    shebang = check_shebang(head)
+    docstring = check_docstring(head)
     type_hints = check_type_hints(contents)
-    
-    # Try to import the file to check for syntax errors
+
+    # Compile to catch syntax errors without executing the module --
+    # exec'ing these scripts would run their import-time side effects
+    # (sys.exit on a missing API key, subprocess calls, etc.)
     try:
-        spec = importlib.util.spec_from_file_location("module.name", file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        print("✅ File imports successfully without syntax errors")
-    except Exception as e:
-        print(f"❌ Error importing file: {e}")
+        compile(contents, file_path, 'exec')
+        print("✅ File compiles without syntax errors")
+    except SyntaxError as e:
+        print(f"❌ Syntax error in file: {e}")
         return False
     
     # Calculate score
@@ -88,12 +95,14 @@ def main():
     python_files = list(repo_dir.glob('*.py')) + list(repo_dir.glob('tests/*.py'))
     
     print(f"Found {len(python_files)} Python files to validate")
-    
-    all_valid = True
-    for file_path in python_files:
-        if not validate_python_file(str(file_path)):
-            all_valid = False
-    
+
+    # Validation is independent per file, so fan out across cores
+    # (output from different files may interleave)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(validate_python_file, map(str, python_files)))
+
+    all_valid = all(results)
+
     if all_valid:
         print("\n✅ All files meet basic standards")
         return 0
@@ -8,68 +8,81 @@ Test script for VAPI API calls
 import os
 import sys
 import json
-import urllib.request
-import urllib.error
+import http.client
+import threading
 import urllib.parse
-import ssl
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 
-# Load API key from .env file
-API_KEY = None
-env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-try:
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.startswith('VAPI_API_KEY='):
-                    API_KEY = line.strip().split('=', 1)[1]
-                    break
-except Exception as e:
-    print(f"Warning: Could not read API key from .env file: {e}")
-
-if not API_KEY:
-    print("Error: VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
-    sys.exit(1)
+# Shared preamble: cached .env parse plus the missing-key error path
+from vapi_common import require_api_key
+
+API_KEY = require_api_key()
+
+# API host all requests go to
+API_HOST = "api.vapi.ai"
+
+# Headers are identical for every request, so build them once
+HEADERS = {
+    "Authorization": f"Bearer {API_KEY}",
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+}
+
+# Keep-alive connections, created lazily and stored per thread so the
+# parallel requests in main() never share a socket. Reusing a
+# connection means only a thread's first request pays the TCP+TLS
+# handshake; subsequent calls go over the already-open connection.
+_local = threading.local()
+
+def _get_connection():
+    """Get (or lazily create) this thread's keep-alive connection"""
+    if getattr(_local, 'connection', None) is None:
+        _local.connection = http.client.HTTPSConnection(API_HOST, timeout=30)
+    return _local.connection
+
+def _reset_connection():
+    """Drop this thread's connection so the next request reconnects"""
+    connection = getattr(_local, 'connection', None)
+    if connection is not None:
+        connection.close()
+        _local.connection = None
 
 def api_request(url, params=None):
-    """Make a request to the VAPI API"""
-    full_url = url
-    
-    # Add query parameters if provided
+    """Make a request to the VAPI API over the shared keep-alive connection"""
+    # Build the request path (the host is fixed)
+    path = urllib.parse.urlsplit(url).path
     if params:
         query_string = urllib.parse.urlencode(params)
-        full_url = f"{url}?{query_string}"
-    
-    print(f"Making request to: {full_url}")
-    
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    
-    # Create request object
-    req = urllib.request.Request(full_url, headers=headers)
-    
+        path = f"{path}?{query_string}"
+
+    print(f"Making request to: https://{API_HOST}{path}")
+
+    response = None
+    # Retry once: the server may have closed an idle keep-alive connection
+    for attempt in range(2):
+        try:
+            conn = _get_connection()
+            conn.request("GET", path, headers=HEADERS)
+            response = conn.getresponse()
+            break
+        except (http.client.HTTPException, ConnectionError, OSError) as e:
+            _reset_connection()
+            if attempt > 0:
+                print(f"Error: {e}")
+                return {}
+
     try:
-        # Ignore SSL verification for simplicity
-        context = ssl._create_unverified_context()
-        
-        # Make the request
-        with urllib.request.urlopen(req, context=context) as response:
-            # Read and parse the response
-            response_data = response.read().decode('utf-8')
-            return json.loads(response_data)
-    except urllib.error.HTTPError as e:
-        print(f"HTTP Error: {e.code} - {e.reason}")
-        response_data = e.read().decode('utf-8')
-        print(f"Response: {response_data}")
-        return {}
-    except urllib.error.URLError as e:
-        print(f"URL Error: {e.reason}")
-        return {}
+        response_data = response.read()
+        if response.status >= 400:
+            print(f"HTTP Error: {response.status} - {response.reason}")
+            print(f"Response: {response_data.decode('utf-8', errors='replace')}")
+            return {}
+        # json.loads accepts bytes directly, skipping a full decode pass
+        return json.loads(response_data)
     except Exception as e:
         print(f"Error: {e}")
+        _reset_connection()
         return {}
 
 def test_api_key():
@@ -130,20 +143,27 @@ def main():
         sys.exit(1)
     
     assistant_id = sys.argv[1]
-    
-    # Test API key
-    if not test_api_key():
+
+    # The key check and call fetch (and the transcript fetch when a call
+    # ID is given explicitly) are independent, so overlap them instead
+    # of paying one round trip after another
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        key_future = executor.submit(test_api_key)
+        calls_future = executor.submit(fetch_calls, assistant_id)
+        transcript_future = None
+        if len(sys.argv) > 2:
+            transcript_future = executor.submit(fetch_transcript, sys.argv[2])
+
+        key_valid = key_future.result()
+        calls = calls_future.result()
+        if transcript_future:
+            transcript_future.result()
+
+    if not key_valid:
         sys.exit(1)
-    
-    # Test fetching calls
-    calls = fetch_calls(assistant_id)
-    
-    # If a call ID is provided, test fetching transcript
-    if len(sys.argv) > 2:
-        call_id = sys.argv[2]
-        fetch_transcript(call_id)
-    # Otherwise, if we found calls, test with the first one
-    elif calls:
+
+    # If no call ID was provided but we found calls, test with the first one
+    if len(sys.argv) <= 2 and calls:
         call_id = calls[0].get('id')
         if call_id:
             print(f"\nTesting transcript with first call ID: {call_id}")
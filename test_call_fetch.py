@@ -8,45 +8,52 @@ Test script to verify call fetching and transcript extraction
 import os
 import sys
 import json
+import functools
 import traceback
 from datetime import datetime
+from operator import attrgetter
+
+# orjson serializes the large call dumps several times faster than
+# stdlib json; fall back silently when it isn't installed
+try:
+    import orjson
+
+    def dumps_indented(obj):
+        """Serialize obj to indented JSON text"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+except ImportError:
+    def dumps_indented(obj):
+        """Serialize obj to indented JSON text"""
+        return json.dumps(obj, indent=2, default=str)
+
+@functools.lru_cache(maxsize=None)
+def parse_iso_date(date_str):
+    """Parse an ISO-8601 timestamp, caching the result per raw string"""
+    try:
+        # Python 3.11+ accepts the 'Z' suffix directly
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
+# Sort keys hoisted to module scope. The C-implemented attrgetter skips
+# the per-element Python lambda call (the SDK models always define
+# these fields, so no getattr default is needed).
+_created_at_key = attrgetter("createdAt")
+_time_key = attrgetter("time")
 
 # Get absolute path to script directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Load API key from .env file
-API_KEY = None
-env_path = os.path.join(SCRIPT_DIR, '.env')
-try:
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.startswith('VAPI_API_KEY='):
-                    API_KEY = line.strip().split('=', 1)[1]
-                    break
-except Exception as e:
-    print(f"Warning: Could not read API key from .env file: {e}")
-
-if not API_KEY:
-    print("Error: VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
-    sys.exit(1)
-
-# Activate virtual environment
-venv_activation = f"source {SCRIPT_DIR}/venv/bin/activate"
-os.system(venv_activation)
+# Shared preamble: cached .env parse, SDK import check, and client cache
+from vapi_common import get_client, require_api_key
 
-try:
-    from vapi import Vapi
-except ImportError:
-    print("Error: VAPI SDK not found. Please run:")
-    print(f"cd {SCRIPT_DIR} && python3 -m venv venv && source venv/bin/activate && pip install vapi_server_sdk")
-    sys.exit(1)
+require_api_key()
 
 def get_all_calls(assistant_id):
     """Fetch all calls for a given assistant ID"""
     print(f"Fetching calls for assistant ID: {assistant_id}")
-    client = Vapi(token=API_KEY)
-    
+    client = get_client()
+
     try:
         response = client.calls.list(assistant_id=assistant_id)
         calls = list(response)
@@ -57,22 +64,39 @@ def get_all_calls(assistant_id):
         traceback.print_exc()
         return []
 
+# id -> call indexes, keyed on the identity of the call list so repeated
+# lookups against the same list reuse one O(n) indexing pass
+_call_indexes = {}
+
 def get_call_by_id(all_calls, call_id):
-    """Find a specific call by ID from a list of calls"""
+    """Find a specific call by ID using a cached id -> call index"""
     print(f"Looking for call with ID: {call_id}")
-    for call in all_calls:
-        if getattr(call, "id", "") == call_id:
-            print(f"Found call with ID: {call_id}")
-            return call
-    
+    index = _call_indexes.get(id(all_calls))
+    if index is None:
+        index = {getattr(call, "id", ""): call for call in all_calls}
+        _call_indexes[id(all_calls)] = index
+
+    call = index.get(call_id)
+    if call is not None:
+        print(f"Found call with ID: {call_id}")
+        return call
+
     print(f"Call with ID {call_id} not found in the list of calls")
     return None
 
+def call_to_dict(call):
+    """Convert a call object to a plain dict in one pass"""
+    try:
+        return call.dict()
+    except Exception:
+        # Fall back to the instance dict, skipping private attributes
+        return {k: v for k, v in vars(call).items() if not k.startswith('_')}
+
 def dump_call_object(call, output_file=None):
     """Dump call object structure for debugging"""
     try:
         call_dict = call.dict()
-        json_str = json.dumps(call_dict, indent=2)
+        json_str = dumps_indented(call_dict)
         
         if output_file:
             with open(output_file, 'w') as f:
@@ -84,13 +108,32 @@ def dump_call_object(call, output_file=None):
         print(f"Error dumping call object: {e}")
         # Try direct attribute dump if dict conversion fails
         print("\nAttributes:")
-        for attr in dir(call):
-            if not attr.startswith('_') and not callable(getattr(call, attr)):
-                try:
-                    value = getattr(call, attr)
-                    print(f"{attr}: {value}")
-                except:
-                    print(f"{attr}: <error getting value>")
+        for attr, value in call_to_dict(call).items():
+            print(f"{attr}: {value}")
+
+def dump_call_attributes(call):
+    """Print every attribute of a call object for debugging"""
+    print("\nAll call attributes:")
+    for attr_name, attr_value in call_to_dict(call).items():
+        if attr_name in ['artifact', 'transcript', 'messages']:
+            print(f"- {attr_name}: {type(attr_value)}")
+            if isinstance(attr_value, list) and attr_value:
+                print(f"  List with {len(attr_value)} items")
+                print(f"  First item type: {type(attr_value[0])}")
+                if isinstance(attr_value[0], dict):
+                    for prop, prop_value in attr_value[0].items():
+                        print(f"    - {prop}: {prop_value}")
+            elif isinstance(attr_value, dict):
+                # If it's an object, print its properties
+                for prop, prop_value in attr_value.items():
+                    if isinstance(prop_value, list):
+                        print(f"  - {prop}: List with {len(prop_value)} items")
+                        if len(prop_value) > 0:
+                            print(f"    First item type: {type(prop_value[0])}")
+                    else:
+                        print(f"  - {prop}: {prop_value}")
+        else:
+            print(f"- {attr_name}: {attr_value}")
 
 def extract_transcript(call):
     """Extract transcript from call object using multiple approaches"""
@@ -100,65 +143,34 @@ def extract_transcript(call):
     call_id = getattr(call, "id", "unknown")
     try:
         created_at = getattr(call, "createdAt", "")
-        call_date = datetime.fromisoformat(created_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+        call_date = parse_iso_date(created_at).strftime('%Y-%m-%d %H:%M:%S')
     except (ValueError, TypeError, AttributeError) as e:
         print(f"Error parsing date: {e}")
         call_date = "Unknown date"
     
-    result = f"# Call - {call_date} (ID: {call_id})\n\n"
+    # Collect fragments in a list and join once at the end; repeated
+    # str += is quadratic in the transcript length
+    parts = [f"# Call - {call_date} (ID: {call_id})\n\n"]
     transcript_found = False
     
-    # Print all available attributes on the call object for debugging
-    print("\nAll call attributes:")
-    for attr_name in dir(call):
-        if not attr_name.startswith('_') and not callable(getattr(call, attr_name)):
-            try:
-                attr_value = getattr(call, attr_name)
-                if attr_name in ['artifact', 'transcript', 'messages']:
-                    print(f"- {attr_name}: {type(attr_value)}")
-                    if attr_value:
-                        if isinstance(attr_value, list):
-                            print(f"  List with {len(attr_value)} items")
-                            if len(attr_value) > 0:
-                                print(f"  First item type: {type(attr_value[0])}")
-                                for prop in dir(attr_value[0]):
-                                    if not prop.startswith('_') and not callable(getattr(attr_value[0], prop)):
-                                        try:
-                                            prop_value = getattr(attr_value[0], prop)
-                                            print(f"    - {prop}: {prop_value}")
-                                        except:
-                                            print(f"    - {prop}: <error>")
-                        else:
-                            # If it's an object, print its properties
-                            for prop in dir(attr_value):
-                                if not prop.startswith('_') and not callable(getattr(attr_value, prop)):
-                                    try:
-                                        prop_value = getattr(attr_value, prop)
-                                        if isinstance(prop_value, list):
-                                            print(f"  - {prop}: List with {len(prop_value)} items")
-                                            if len(prop_value) > 0:
-                                                print(f"    First item type: {type(prop_value[0])}")
-                                        else:
-                                            print(f"  - {prop}: {prop_value}")
-                                    except:
-                                        print(f"  - {prop}: <error>")
-                else:
-                    print(f"- {attr_name}: {attr_value}")
-            except:
-                print(f"- {attr_name}: <error getting value>")
-                
+    # Print all available attributes on the call object for debugging.
+    # The dump is only useful during development and dominates this
+    # function's runtime, so gate it behind VAPI_DEBUG.
+    if os.environ.get("VAPI_DEBUG"):
+        dump_call_attributes(call)
+
     # 1. Try direct transcript attribute if available
     transcript = getattr(call, "transcript", None)
     if transcript:
         print(f"\nFound transcript attribute with {len(transcript)} entries")
         transcript_found = True
         # Sort transcript entries by creation time
-        sorted_entries = sorted(transcript, key=lambda x: getattr(x, "createdAt", ""))
+        sorted_entries = sorted(transcript, key=_created_at_key)
         
         for entry in sorted_entries:
             role = "AI" if getattr(entry, "role", "") == "assistant" else "Human"
             content = getattr(entry, "content", "")
-            result += f"{role}: {content}\n\n"
+            parts.append(f"{role}: {content}\n\n")
     
     # 2. Try messages in artifact
     artifact = getattr(call, "artifact", None)
@@ -168,39 +180,37 @@ def extract_transcript(call):
             print(f"\nFound artifact messages with {len(messages)} entries")
             transcript_found = True
             # Sort messages by time
-            sorted_messages = sorted(messages, key=lambda x: getattr(x, "time", 0))
+            sorted_messages = sorted(messages, key=_time_key)
             
             for message in sorted_messages:
                 role = "AI" if getattr(message, "role", "") == "bot" else "Human"
                 content = getattr(message, "message", "")
-                result += f"{role}: {content}\n\n"
+                parts.append(f"{role}: {content}\n\n")
     
     # 3. Try the messages attribute directly if available
     messages = getattr(call, "messages", [])
     if messages:
         print(f"\nFound messages attribute with {len(messages)} entries")
         transcript_found = True
-        sorted_messages = sorted(messages, key=lambda x: getattr(x, "createdAt", ""))
+        sorted_messages = sorted(messages, key=_created_at_key)
         
         for message in sorted_messages:
             role = "AI" if getattr(message, "role", "") == "assistant" else "Human"
             content = getattr(message, "content", "")
-            result += f"{role}: {content}\n\n"
+            parts.append(f"{role}: {content}\n\n")
     
     if not transcript_found:
         print("No transcript found in any attribute")
-        result += "No transcript available for this call\n\n"
-    
-    result += "---\n\n"
-    return result
+        parts.append("No transcript available for this call\n\n")
+
+    parts.append("---\n\n")
+    return "".join(parts)
 
 def main():
     # Use specific assistant ID and call ID for testing
     assistant_id = "a37edc9f-852d-41b3-8601-801c20292716"
     specific_call_id = "aafc223a-49fa-4964-96c3-dd320832ca5f"
-    
-    client = Vapi(token=API_KEY)
-    
+
     # Test 1: Get all calls for assistant
     print("\n=== TEST 1: Fetch all calls for assistant ===")
     calls = get_all_calls(assistant_id)
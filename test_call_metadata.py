@@ -4,44 +4,29 @@
 import os
 import sys
 import json
+import itertools
 from datetime import datetime
 from pprint import pprint
 
 # Get the absolute path to the script directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Load API key from .env file
-API_KEY = None
-env_path = os.path.join(SCRIPT_DIR, '.env')
-try:
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if line.startswith('VAPI_API_KEY='):
-                    API_KEY = line.strip().split('=', 1)[1]
-                    break
-except Exception as e:
-    print(f"Warning: Could not read API key from .env file: {e}")
+# Shared preamble: cached .env parse, SDK import check, and client cache
+from vapi_common import get_client, require_api_key
 
-if not API_KEY:
-    print("Error: VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
-    sys.exit(1)
+require_api_key()
 
-# Activate virtual environment and import the SDK
-try:
-    from vapi import Vapi
-except ImportError:
-    print("Error: VAPI SDK not found. Installing via pip...")
-    os.system(f"cd {SCRIPT_DIR} && python3 -m venv venv && source venv/bin/activate && pip install vapi_server_sdk")
+def call_to_dict(call):
+    """Convert a call object to a plain dict in one pass"""
     try:
-        from vapi import Vapi
-    except ImportError:
-        print("Error: Failed to install VAPI SDK")
-        sys.exit(1)
+        return call.dict()
+    except Exception:
+        # Fall back to the instance dict, skipping private attributes
+        return {k: v for k, v in vars(call).items() if not k.startswith('_')}
 
 def explore_metadata():
     """Explore available metadata in VAPI calls"""
-    client = Vapi(token=API_KEY)
+    client = get_client()
     
     # Get assistants
     print("Fetching assistants...")
@@ -63,16 +48,17 @@ def explore_metadata():
     assistant_id = assistant.id
     print(f"\nUsing assistant: {getattr(assistant, 'name', 'unknown')} (ID: {assistant_id})")
     
-    # Fetch calls
+    # Fetch calls. Only a handful are examined, so stop the paginator
+    # after the first few instead of fetching every page
     print("\nFetching calls...")
     response = client.calls.list(assistant_id=assistant_id)
-    calls = list(response)
-    
+    calls = list(itertools.islice(response, 5))
+
     if not calls:
         print("No calls found")
         return
-    
-    print(f"Found {len(calls)} calls")
+
+    print(f"Examining first {len(calls)} calls")
     
     # Analyze date format
     print("\nAnalyzing date formats in calls...")
@@ -109,30 +95,22 @@ def explore_metadata():
     metadata_fields = {}
     
     for call in calls[:5]:  # Check first 5 calls
-        for attr in dir(call):
-            if not attr.startswith('_'):  # Skip private attributes
-                try:
-                    value = getattr(call, attr)
-                    if not callable(value):  # Skip methods
-                        if attr not in metadata_fields:
-                            metadata_fields[attr] = []
-                        
-                        # Add the type and a sample value
-                        if len(metadata_fields[attr]) < 3:  # Keep up to 3 samples
-                            if isinstance(value, (str, int, float, bool)) or value is None:
-                                sample = value
-                            elif hasattr(value, '__dict__'):
-                                sample = "Object"
-                            elif isinstance(value, (list, tuple)):
-                                sample = f"List ({len(value)} items)"
-                            else:
-                                sample = type(value).__name__
-                            
-                            metadata_fields[attr].append(sample)
-                except Exception as e:
-                    if attr not in metadata_fields:
-                        metadata_fields[attr] = []
-                    metadata_fields[attr].append(f"Error: {str(e)}")
+        # One dict conversion per call instead of a dir()/getattr walk
+        for attr, value in call_to_dict(call).items():
+            samples = metadata_fields.setdefault(attr, [])
+
+            # Add the type and a sample value
+            if len(samples) < 3:  # Keep up to 3 samples
+                if isinstance(value, (str, int, float, bool)) or value is None:
+                    sample = value
+                elif isinstance(value, dict):
+                    sample = "Object"
+                elif isinstance(value, (list, tuple)):
+                    sample = f"List ({len(value)} items)"
+                else:
+                    sample = type(value).__name__
+
+                samples.append(sample)
     
     print("\nAvailable metadata fields:")
     for field, samples in sorted(metadata_fields.items()):
@@ -140,34 +118,23 @@ def explore_metadata():
     
     # Get complete structure of a single call
     print("\nComplete structure of a single call:")
-    call = calls[0]
-    for attr in sorted(dir(call)):
-        if not attr.startswith('_'):  # Skip private attributes
-            try:
-                value = getattr(call, attr)
-                if not callable(value):  # Skip methods
-                    if isinstance(value, (str, int, float, bool)) or value is None:
-                        print(f"- {attr}: {value}")
-                    elif hasattr(value, '__dict__'):
-                        # Print object structure
-                        sub_attrs = [a for a in dir(value) if not a.startswith('_') and not callable(getattr(value, a))]
-                        print(f"- {attr}: Object with {len(sub_attrs)} attributes")
-                        for sub_attr in sorted(sub_attrs):
-                            try:
-                                sub_value = getattr(value, sub_attr)
-                                print(f"  - {sub_attr}: {sub_value if not isinstance(sub_value, (list, dict)) else type(sub_value).__name__}")
-                            except:
-                                print(f"  - {sub_attr}: <error>")
-                    elif isinstance(value, (list, tuple)):
-                        print(f"- {attr}: List with {len(value)} items")
-                        if len(value) > 0:
-                            item = value[0]
-                            if hasattr(item, '__dict__'):
-                                print(f"  First item attributes: {', '.join(sorted([a for a in dir(item) if not a.startswith('_') and not callable(getattr(item, a))]))}")
-                    else:
-                        print(f"- {attr}: {type(value).__name__}")
-            except Exception as e:
-                print(f"- {attr}: Error: {str(e)}")
+    call_fields = call_to_dict(calls[0])
+    for attr in sorted(call_fields):
+        value = call_fields[attr]
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            print(f"- {attr}: {value}")
+        elif isinstance(value, dict):
+            # Print object structure
+            print(f"- {attr}: Object with {len(value)} attributes")
+            for sub_attr in sorted(value):
+                sub_value = value[sub_attr]
+                print(f"  - {sub_attr}: {sub_value if not isinstance(sub_value, (list, dict)) else type(sub_value).__name__}")
+        elif isinstance(value, (list, tuple)):
+            print(f"- {attr}: List with {len(value)} items")
+            if len(value) > 0 and isinstance(value[0], dict):
+                print(f"  First item attributes: {', '.join(sorted(value[0]))}")
+        else:
+            print(f"- {attr}: {type(value).__name__}")
 
 def main():
     try:
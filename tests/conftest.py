@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared pytest configuration and fixtures for the test suite.
+
+Every test here is pure-mock (no filesystem, network, or subprocess
+side effects), so the suite is safe to run in parallel with
+pytest-xdist (`pytest -n auto --dist=loadfile tests/`).
+"""
+
+import copy
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Disable the module's file logging before vapi_transcripts is first
+# imported: its import-time log() calls would otherwise append to the
+# real debug log in every session. Set here (conftest loads before any
+# test module) so _LOG_DISABLED is computed with the switch in place.
+os.environ.setdefault('VAPI_LOG_LEVEL', 'off')
+
+# Prototype successful subprocess result, built once; fixtures hand out
+# shallow copies so tests can tweak attributes without sharing state
+_OK_PROC = SimpleNamespace(stdout="", stderr="", returncode=0)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_subprocess():
+    """
+    Safety net: replace subprocess.run for the whole session.
+
+    Every test drives the module functions in-process and mocks its own
+    subprocess interactions; this guard makes sure a code path missed
+    by per-test mocking can never fork a real osascript/pbcopy child.
+    """
+    import subprocess
+    from unittest.mock import MagicMock
+
+    def _forbid_popen(*args, **kwargs):
+        raise AssertionError(
+            "test tried to spawn a real process via subprocess.Popen")
+
+    original_run = subprocess.run
+    original_popen = subprocess.Popen
+    subprocess.run = MagicMock(
+        return_value=SimpleNamespace(stdout="", stderr="", returncode=0))
+    # Nothing under test uses Popen directly, so any call to it is a
+    # leak past the mocks; fail loudly rather than forking
+    subprocess.Popen = _forbid_popen
+    yield
+    subprocess.run = original_run
+    subprocess.Popen = original_popen
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_assistant_cache():
+    """
+    Safety net: neutralize the on-disk assistant-ID cache.
+
+    Keeps the suite from reading a developer's real ~/.cache entry or
+    writing one from test runs; cache-specific tests re-patch the
+    helpers themselves.
+    """
+    import vapi_transcripts
+    originals = (vapi_transcripts._load_cached_assistant,
+                 vapi_transcripts._store_cached_assistant,
+                 vapi_transcripts._clear_cached_assistant)
+    vapi_transcripts._load_cached_assistant = lambda: None
+    vapi_transcripts._store_cached_assistant = lambda assistant_id: None
+    vapi_transcripts._clear_cached_assistant = lambda: None
+    yield
+    (vapi_transcripts._load_cached_assistant,
+     vapi_transcripts._store_cached_assistant,
+     vapi_transcripts._clear_cached_assistant) = originals
+
+
+@pytest.fixture
+def ok_proc():
+    """A per-test copy of the successful-subprocess prototype"""
+    return copy.copy(_OK_PROC)
+
+
+@pytest.fixture
+def patched_env(monkeypatch):
+    """
+    Pre-wired mocks for the environment-setup call graph.
+
+    Patches the leaf dependencies (os.path.exists, os.path.getmtime,
+    builtins.open, subprocess.run, run_with_venv) in one place and hands
+    the mocks back, so each test tweaks only the attributes it cares
+    about instead of rebuilding the same patch stack.
+
+    getmtime raises OSError so the venv stamp-file fast path always
+    misses, and open is mocked so the stamp write never touches the
+    developer's real venv — the tests behave the same whether or not
+    the tool has been run on this checkout.
+    """
+    from unittest.mock import MagicMock
+
+    mocks = SimpleNamespace(
+        exists=MagicMock(return_value=True),
+        getmtime=MagicMock(side_effect=OSError),
+        open=MagicMock(),
+        subprocess_run=MagicMock(
+            return_value=SimpleNamespace(stdout="", stderr="", returncode=0)),
+        run_with_venv=MagicMock(
+            return_value=SimpleNamespace(stdout="vapi 1.0.0", stderr="",
+                                         returncode=0)),
+    )
+    monkeypatch.setattr('os.path.exists', mocks.exists)
+    monkeypatch.setattr('os.path.getmtime', mocks.getmtime)
+    monkeypatch.setattr('builtins.open', mocks.open)
+    monkeypatch.setattr('subprocess.run', mocks.subprocess_run)
+    monkeypatch.setattr('vapi_transcripts.run_with_venv', mocks.run_with_venv)
+    return mocks
+
+
+@pytest.fixture(scope="session")
+def vt():
+    """The vapi_transcripts module, imported once per session"""
+    import vapi_transcripts
+    return vapi_transcripts
+
+
+@pytest.fixture(scope="module")
+def sample_tabs():
+    """Sample Chrome tab URLs shared by tab-scanning tests.
+
+    A tuple, so the one shared instance cannot be mutated by a test.
+    """
+    return (
+        "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716",
+        "https://google.com",
+        "https://dashboard.vapi.ai/call/456?assistantId=b47edc9f-852d-41b3-8601-801c20292717"
+    )
+
+
+@pytest.fixture
+def fresh_vt():
+    """
+    Reload vapi_transcripts and return the clean module.
+
+    Only for tests that depend on pristine module-global state; every
+    other test shares the session-scoped vt fixture, so the reload cost
+    is paid exactly where it is needed.
+    """
+    import importlib
+
+    import vapi_transcripts
+    return importlib.reload(vapi_transcripts)
@@ -8,74 +8,77 @@ Integration tests for vapi-transcripts.py script
 import os
 import sys
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
-import subprocess
-import json
-
-# Add parent directory to path so we can import the script
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
 
 # We'll import the functions but mock external dependencies
 import vapi_transcripts
 
+# Default parsed-args values shared by every workflow test; each test
+# overrides only the attributes it cares about
+_DEFAULT_ARGS = dict(assistant_id=None, output=None, no_paste=False,
+                     min_duration=0, days=None, today=False, limit=None)
+
+def _make_args(**overrides):
+    """Build a parsed-args stand-in from the defaults plus overrides"""
+    return SimpleNamespace(**{**_DEFAULT_ARGS, **overrides})
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for VAPI transcripts script"""
 
-    def setUp(self):
-        """Set up test environment"""
-        # Save actual environment to restore it after tests
-        self.original_env = os.environ.copy()
-        
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test environment once for the class"""
+        # Save actual environment to restore it after tests. No test
+        # mutates the environment or the .env file, so one snapshot
+        # and one file write cover the whole class.
+        cls.original_env = os.environ.copy()
+
         # Sample test data
-        self.sample_assistant_id = "a37edc9f-852d-41b3-8601-801c20292716"
-        self.sample_api_key = "test_api_key"  # Not a real API key
-        
-        # Create a temp .env file for testing
-        with open('.env.test', 'w') as f:
-            f.write(f"VAPI_API_KEY={self.sample_api_key}\n")
-        
-    def tearDown(self):
-        """Clean up after tests"""
+        cls.sample_assistant_id = "a37edc9f-852d-41b3-8601-801c20292716"
+        cls.sample_api_key = "test_api_key"  # Not a real API key
+
+        # Bind main once instead of re-importing it in every test
+        cls._main = staticmethod(vapi_transcripts.main)
+
+        # Blanket-patch subprocess.run for the whole class so no code
+        # path missed by per-test mocking can spawn a real osascript
+        cls._subprocess_patcher = patch(
+            'subprocess.run',
+            MagicMock(return_value=SimpleNamespace(stdout='', stderr='',
+                                                   returncode=0)))
+        cls._subprocess_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after the class has run"""
+        cls._subprocess_patcher.stop()
+
         # Restore original environment
         os.environ.clear()
-        os.environ.update(self.original_env)
-        
-        # Remove test .env file
-        if os.path.exists('.env.test'):
-            os.remove('.env.test')
+        os.environ.update(cls.original_env)
     
-    @patch('subprocess.run')
-    @patch('vapi_transcripts.get_foreground_tab_url')
+    @patch('vapi_transcripts.get_chrome_state')
     @patch('vapi_transcripts.check_venv_setup')
     @patch('vapi_transcripts.fetch_transcripts')
     @patch('vapi_transcripts.process_transcripts')
     @patch('vapi_transcripts.check_api_key')
     @patch('vapi_transcripts.parse_args')
     def test_workflow_with_foreground_tab(self, mock_parse_args, mock_check_api, mock_process, 
-                                          mock_fetch, mock_venv, mock_get_url, mock_run):
+                                          mock_fetch, mock_venv, mock_get_state):
         """Test the workflow when the assistant ID is in the foreground tab"""
-        # Set up all mocks
-        mock_args = MagicMock()
-        mock_args.assistant_id = None
-        mock_args.output = None
-        mock_args.no_paste = False
-        mock_args.min_duration = 0
-        mock_args.days = None
-        mock_args.today = False
-        mock_args.limit = None
-        mock_parse_args.return_value = mock_args
-        
+        # Set up all mocks. SimpleNamespace is enough for the parsed
+        # args: plain attribute reads, no MagicMock child machinery.
+        mock_parse_args.return_value = _make_args()
+
         mock_venv.return_value = True
         mock_check_api.return_value = self.sample_api_key
-        mock_get_url.return_value = f"https://dashboard.vapi.ai/call/123?assistantId={self.sample_assistant_id}"
+        mock_get_state.return_value = (
+            f"https://dashboard.vapi.ai/call/123?assistantId={self.sample_assistant_id}", [])
         mock_process.return_value = True
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        # Import the main function
-        from vapi_transcripts import main
         
         # Call the main function directly
-        result = main()
+        result = self._main()
         
         # Check if the script executed without error
         self.assertEqual(result, 0)
@@ -93,30 +96,21 @@ class TestIntegration(unittest.TestCase):
             no_paste=False
         )
             
-    @patch('subprocess.run')
-    @patch('vapi_transcripts.get_foreground_tab_url')
+    @patch('vapi_transcripts.get_chrome_state')
     @patch('vapi_transcripts.find_vapi_tabs') 
     @patch('vapi_transcripts.check_venv_setup')
     @patch('vapi_transcripts.process_transcripts')
     @patch('vapi_transcripts.check_api_key')
     @patch('vapi_transcripts.parse_args')
     def test_workflow_with_multiple_tabs(self, mock_parse_args, mock_check_api, mock_process, 
-                                         mock_venv, mock_find_tabs, mock_get_url, mock_run):
+                                         mock_venv, mock_find_tabs, mock_get_state):
         """Test the workflow when the assistant ID is not in the foreground tab"""
         # Set up all mocks
-        mock_args = MagicMock()
-        mock_args.assistant_id = None
-        mock_args.output = None
-        mock_args.no_paste = False
-        mock_args.min_duration = 0
-        mock_args.days = None
-        mock_args.today = False
-        mock_args.limit = None
-        mock_parse_args.return_value = mock_args
-        
+        mock_parse_args.return_value = _make_args()
+
         mock_venv.return_value = True
         mock_check_api.return_value = self.sample_api_key
-        mock_get_url.return_value = "https://google.com"  # No assistant ID in foreground
+        mock_get_state.return_value = ("https://google.com", [])  # No assistant ID in foreground
         mock_find_tabs.return_value = [
             ("https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716", 
              "a37edc9f-852d-41b3-8601-801c20292716"),
@@ -124,13 +118,9 @@ class TestIntegration(unittest.TestCase):
              "b47edc9f-852d-41b3-8601-801c20292717")
         ]
         mock_process.return_value = True
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        # Import the main function
-        from vapi_transcripts import main
         
         # Call the main function directly
-        result = main()
+        result = self._main()
         
         # Check if the script executed without error
         self.assertEqual(result, 0)
@@ -147,37 +137,24 @@ class TestIntegration(unittest.TestCase):
             no_paste=False
         )
 
-    @patch('subprocess.run')
     @patch('vapi_transcripts.parse_args')
-    @patch('vapi_transcripts.get_foreground_tab_url')
+    @patch('vapi_transcripts.get_chrome_state')
     @patch('vapi_transcripts.check_venv_setup')
     @patch('vapi_transcripts.process_transcripts')
     @patch('vapi_transcripts.check_api_key')
     def test_command_line_args(self, mock_check_api, mock_process, mock_venv, 
-                               mock_get_url, mock_parse_args, mock_run):
+                               mock_get_state, mock_parse_args):
         """Test the workflow with command-line arguments"""
-        # Create a mock args object
-        mock_args = MagicMock()
-        mock_args.assistant_id = "manually-specified-id"
-        mock_args.output = "test_output.md"
-        mock_args.no_paste = True
-        mock_args.min_duration = 60
-        mock_args.days = 7
-        mock_args.today = False
-        mock_args.limit = 5
-        
         # Set up all mocks
-        mock_parse_args.return_value = mock_args
+        mock_parse_args.return_value = _make_args(
+            assistant_id="manually-specified-id", output="test_output.md",
+            no_paste=True, min_duration=60, days=7, limit=5)
         mock_venv.return_value = True
         mock_check_api.return_value = self.sample_api_key
         mock_process.return_value = True
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        # Import the main function
-        from vapi_transcripts import main
         
         # Call the main function directly
-        result = main()
+        result = self._main()
         
         # Check if the script executed without error
         self.assertEqual(result, 0)
@@ -194,8 +171,8 @@ class TestIntegration(unittest.TestCase):
             no_paste=True
         )
         
-        # Verify Chrome URL was not fetched since we provided assistant_id via args
-        mock_get_url.assert_not_called()
+        # Verify Chrome was not queried since we provided assistant_id via args
+        mock_get_state.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
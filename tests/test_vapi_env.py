@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the shared vapi_env .env loader
+"""
+
+import os
+import unittest
+import tempfile
+
+from vapi_env import load_env, load_api_key
+
+class TestVapiEnv(unittest.TestCase):
+    """Test suite for the .env loader module"""
+
+    def setUp(self):
+        """Reset the per-process caches between tests"""
+        load_env.cache_clear()
+        load_api_key.cache_clear()
+
+    def tearDown(self):
+        """Reset the per-process caches after tests"""
+        load_env.cache_clear()
+        load_api_key.cache_clear()
+
+    def _write_env(self, contents):
+        """Write a temporary .env file and return its path"""
+        f = tempfile.NamedTemporaryFile('w', suffix='.env', delete=False)
+        f.write(contents)
+        f.close()
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def test_load_env_parses_keys(self):
+        """Test that load_env parses key=value lines into a dict"""
+        env_path = self._write_env("VAPI_API_KEY=test_api_key\nOTHER=value\n")
+
+        env_vars = load_env(env_path)
+
+        self.assertEqual(env_vars['VAPI_API_KEY'], "test_api_key")
+        self.assertEqual(env_vars['OTHER'], "value")
+
+    def test_load_env_skips_comments_and_blank_lines(self):
+        """Test that comments and blank lines are ignored"""
+        env_path = self._write_env("# comment\n\nVAPI_API_KEY=test_api_key\n")
+
+        env_vars = load_env(env_path)
+
+        self.assertEqual(env_vars, {'VAPI_API_KEY': "test_api_key"})
+
+    def test_load_env_missing_file(self):
+        """Test that a missing file yields an empty dict"""
+        env_vars = load_env('/nonexistent/.env')
+
+        self.assertEqual(env_vars, {})
+
+    def test_load_env_is_cached(self):
+        """Test that repeated calls hit the in-process cache"""
+        env_path = self._write_env("VAPI_API_KEY=test_api_key\n")
+
+        first = load_env(env_path)
+        # Rewrite the file; the cached result should still be returned
+        with open(env_path, 'w') as f:
+            f.write("VAPI_API_KEY=changed\n")
+        second = load_env(env_path)
+
+        self.assertIs(first, second)
+        self.assertEqual(second['VAPI_API_KEY'], "test_api_key")
+
+    def test_load_api_key(self):
+        """Test that load_api_key returns the VAPI key"""
+        env_path = self._write_env("VAPI_API_KEY=test_api_key\n")
+
+        self.assertEqual(load_api_key(env_path), "test_api_key")
+
+    def test_load_api_key_missing(self):
+        """Test that load_api_key returns None when the key is absent"""
+        env_path = self._write_env("NOT_A_VAPI_KEY=something\n")
+
+        self.assertIsNone(load_api_key(env_path))
+
+if __name__ == '__main__':
+    unittest.main()
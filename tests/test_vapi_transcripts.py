@@ -5,584 +5,584 @@
 Unit tests for vapi-transcripts.py script
 """
 
+import io
 import os
 import sys
-import unittest
 import subprocess
-from unittest.mock import patch, MagicMock, mock_open
-from datetime import datetime
-import json
-
-# Add parent directory to path so we can import the script
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Import functions from the script
-# Note: We're importing individual functions to avoid executing the main script
-from vapi_transcripts import (
-    extract_assistant_id,
-    find_vapi_tabs,
-    copy_to_clipboard,
-    check_api_key,
-    fetch_transcripts,
-    paste_from_clipboard,
-    get_foreground_tab_url,
-    get_chrome_tabs,
-    check_venv_setup,
-    run_with_venv
-)
-
-class TestVAPITranscripts(unittest.TestCase):
-    """Test suite for VAPI transcripts script"""
-
-    def setUp(self):
-        """Set up test environment"""
-        # Mock environment variables and paths
-        self.mock_env_vars = {
-            'SCRIPT_DIR': '/fake/path',
-            'LOG_FILE': '/fake/path/vapi_transcript_debug.log'
-        }
-        
-        # Sample test data
-        self.sample_assistant_id = "a37edc9f-852d-41b3-8601-801c20292716"
-        self.sample_chrome_tabs = [
-            "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716",
-            "https://google.com",
-            "https://dashboard.vapi.ai/call/456?assistantId=b47edc9f-852d-41b3-8601-801c20292717"
-        ]
-        
-    @patch('subprocess.run')
-    def test_copy_to_clipboard(self, mock_run):
-        """Test copy_to_clipboard function"""
-        test_text = "Test transcript"
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        copy_to_clipboard(test_text)
-        
-        mock_run.assert_called_once()
-        # Check that pbcopy was called with the correct input
-        args, kwargs = mock_run.call_args
-        self.assertEqual(kwargs['input'], test_text.encode('utf-8'))
-        
-    @patch('subprocess.run')
-    def test_get_foreground_tab_url(self, mock_run):
-        """Test get_foreground_tab_url function"""
-        # Mock successful command execution
-        mock_process = MagicMock()
-        mock_process.stdout = "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
-        mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        
-        # Call the function
-        url = get_foreground_tab_url()
-        
-        # Verify result
-        self.assertEqual(url, "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716")
-        mock_run.assert_called_once()
-        
-    @patch('subprocess.run')
-    def test_get_chrome_tabs(self, mock_run):
-        """Test get_chrome_tabs function"""
-        # First mock the Chrome running check
-        check_mock = MagicMock()
-        check_mock.stdout = "true"
-        check_mock.returncode = 0
-        
-        # Then mock the tab retrieval
-        tabs_mock = MagicMock()
-        tabs_mock.stdout = "https://example.com|https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716|"
-        tabs_mock.returncode = 0
-        
-        # Setup the mock to return different values on successive calls
-        mock_run.side_effect = [check_mock, tabs_mock]
-        
-        # Call the function
-        tabs = get_chrome_tabs()
-        
-        # Verify result
-        self.assertEqual(len(tabs), 2)
-        self.assertEqual(tabs[0], "https://example.com")
-        self.assertEqual(tabs[1], "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716")
-        self.assertEqual(mock_run.call_count, 2)
-        
-    def test_extract_assistant_id(self):
-        """Test extract_assistant_id function"""
-        # Test valid URL with assistant ID
-        url = "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
-        assistant_id = extract_assistant_id(url)
-        self.assertEqual(assistant_id, "a37edc9f-852d-41b3-8601-801c20292716")
-        
-        # Test URL without assistant ID
-        url = "https://google.com"
-        assistant_id = extract_assistant_id(url)
-        self.assertIsNone(assistant_id)
-        
-        # Test URL with assistant ID in different position
-        url = "https://dashboard.vapi.ai?foo=bar&assistantId=a37edc9f-852d-41b3-8601-801c20292716&other=stuff"
-        assistant_id = extract_assistant_id(url)
-        self.assertEqual(assistant_id, "a37edc9f-852d-41b3-8601-801c20292716")
-        
-        # Test empty URL
-        url = ""
-        assistant_id = extract_assistant_id(url)
-        self.assertIsNone(assistant_id)
-        
-    @patch('vapi_transcripts.get_chrome_tabs')
-    def test_find_vapi_tabs(self, mock_get_tabs):
-        """Test find_vapi_tabs function"""
-        mock_get_tabs.return_value = self.sample_chrome_tabs
-        
-        tabs = find_vapi_tabs()
-        
-        self.assertEqual(len(tabs), 2)  # Should find 2 tabs with assistant IDs
-        self.assertEqual(tabs[0][1], "a37edc9f-852d-41b3-8601-801c20292716")
-        self.assertEqual(tabs[1][1], "b47edc9f-852d-41b3-8601-801c20292717")
-        
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open, read_data="VAPI_API_KEY=test_api_key")
-    def test_check_api_key(self, mock_file, mock_exists):
-        """Test check_api_key function"""
-        mock_exists.return_value = True
-        
-        api_key = check_api_key()
-        
-        self.assertEqual(api_key, "test_api_key")
-        
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open, read_data="NOT_A_VAPI_KEY=something")
-    def test_check_api_key_missing(self, mock_file, mock_exists):
-        """Test check_api_key function when key is missing"""
-        mock_exists.return_value = True
-        
-        api_key = check_api_key()
-        
-        self.assertIsNone(api_key)
-    
-    # Simple tests for paste_from_clipboard on different platforms
-    @patch('sys.platform', 'darwin')
-    @patch('subprocess.run')
-    def test_darwin_paste(self, mock_run):
-        """Test paste on macOS"""
-        mock_run.return_value = MagicMock(returncode=0)
-        self.assertTrue(paste_from_clipboard())
-        mock_run.assert_called_once()
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, mock_open, call
 
-    @patch('sys.platform', 'linux')
-    def test_linux_paste(self):
-        """Test paste on Linux"""
-        # On Linux we just return True for CI compatibility
-        self.assertTrue(paste_from_clipboard())
-
-    @patch('sys.platform', 'win32')
-    @patch('builtins.print')  # Suppress output during test
-    def test_windows_paste_no_pyautogui(self, mock_print):
-        """Test paste on Windows without pyautogui"""
-        # Mock the ImportError for pyautogui
-        with patch('builtins.__import__', side_effect=ImportError("No module named 'pyautogui'")):
-            # Without pyautogui, it returns False on Windows
-            self.assertFalse(paste_from_clipboard())
-            
-    @patch('sys.platform', 'win32')
-    def test_windows_paste_with_pyautogui(self):
-        """Test paste on Windows with pyautogui available"""
-        # Mock pyautogui module
-        mock_pyautogui = MagicMock()
-        # Use a context manager to temporarily mock the import of pyautogui
-        with patch.dict('sys.modules', {'pyautogui': mock_pyautogui}):
-            # With pyautogui available, it returns True
-            self.assertTrue(paste_from_clipboard())
-            # Verify that hotkey was called
-            mock_pyautogui.hotkey.assert_called_once_with('ctrl', 'v')
-
-    @patch('sys.platform', 'darwin')
-    @patch('subprocess.run')
-    @patch('builtins.print')  # Suppress output during test
-    def test_darwin_paste_error(self, mock_print, mock_run):
-        """Test paste error handling on macOS"""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "osascript")
-        # The function returns False when subprocess.run raises an exception
-        self.assertFalse(paste_from_clipboard())
-        mock_run.assert_called_once()
-        
-    @patch('os.path.exists')
-    @patch('vapi_transcripts.run_with_venv')
-    def test_check_venv_setup_exists(self, mock_run_with_venv, mock_exists):
-        """Test check_venv_setup function when venv exists"""
-        # Mock venv directory exists
-        mock_exists.return_value = True
-        # Mock successful pip command
-        mock_run_with_venv.return_value = MagicMock(stdout="vapi 1.0.0", returncode=0)
-        
-        result = check_venv_setup()
-        
-        self.assertTrue(result)
-        mock_exists.assert_called_once()
-        mock_run_with_venv.assert_called_once()
-        
-    @patch('os.path.exists')
-    @patch('subprocess.run')
-    def test_check_venv_setup_not_exists(self, mock_run, mock_exists):
-        """Test check_venv_setup function when venv doesn't exist"""
-        # Mock venv directory doesn't exist
-        mock_exists.return_value = False
-        # Mock successful venv creation
-        mock_run.return_value = MagicMock(returncode=0)
-        
-        with patch('vapi_transcripts.run_with_venv') as mock_run_with_venv:
-            mock_run_with_venv.return_value = MagicMock(stdout="vapi 1.0.0", returncode=0)
-            result = check_venv_setup()
-            
-        self.assertTrue(result)
-        mock_exists.assert_called_once()
+import pytest
+
+# The module under test is provided by the session-scoped `vt` fixture
+# in conftest.py, so it is imported and bound exactly once per run.
+
+# Sample assistant ID shared across tests
+SAMPLE_ASSISTANT_ID = "a37edc9f-852d-41b3-8601-801c20292716"
+
+# Reusable failure for subprocess side effects, built once
+OSASCRIPT_ERR = subprocess.CalledProcessError(1, "osascript")
+
+# Expected call shapes built once instead of per-assertion
+EXPECTED_FETCH_CALL = call(SAMPLE_ASSISTANT_ID, "test-api-key",
+                           min_duration=60, days_ago=7, limit=5,
+                           today_only=True)
+EXPECTED_PROCESS_CALL = call("test-assistant-id", "test-api-key",
+                             output_file=None, min_duration=0, days_ago=None,
+                             limit=None, today_only=False, no_paste=False)
+
+
+def test_copy_to_clipboard(monkeypatch, vt, ok_proc):
+    """Test copy_to_clipboard function"""
+    test_text = "Test transcript"
+    mock_run = MagicMock(return_value=ok_proc)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    vt.copy_to_clipboard(test_text)
+
+    mock_run.assert_called_once()
+    # Check that pbcopy was called with the correct input
+    args, kwargs = mock_run.call_args
+    assert kwargs['input'] == test_text.encode('utf-8')
+
+
+def test_get_foreground_tab_url(monkeypatch, vt, ok_proc):
+    """Test get_foreground_tab_url function"""
+    # Mock successful command execution; a plain namespace carries the
+    # stdout/returncode shape without MagicMock's attribute machinery
+    ok_proc.stdout = "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
+    mock_run = MagicMock(return_value=ok_proc)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    # Call the function
+    url = vt.get_foreground_tab_url()
+
+    # Verify result
+    assert url == "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
+    mock_run.assert_called_once()
+
+
+def test_get_chrome_tabs(monkeypatch, vt):
+    """Test get_chrome_tabs function"""
+    # Start from a cold tab cache regardless of test order
+    monkeypatch.setattr(vt, '_TAB_CACHE', None)
+    # Mock the single tab-enumeration call; there is no separate
+    # "is Chrome running" probe any more
+    tabs_mock = SimpleNamespace(
+        stdout="https://example.com|https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716|",
+        stderr="", returncode=0)
+    mock_run = MagicMock(return_value=tabs_mock)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    # Call the function
+    tabs = vt.get_chrome_tabs()
+
+    # Verify result
+    assert len(tabs) == 2
+    assert tabs[0] == "https://example.com"
+    assert tabs[1] == "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
+    mock_run.assert_called_once()
+
+
+def test_get_chrome_state(monkeypatch, vt, ok_proc):
+    """Test get_chrome_state function"""
+    # One osascript call returns the foreground URL plus the tab list
+    ok_proc.stdout = ("FOREGROUND:https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716\n"
+                      "https://example.com|https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716")
+    mock_run = MagicMock(return_value=ok_proc)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    foreground_url, tabs = vt.get_chrome_state()
+
+    assert foreground_url == "https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
+    assert len(tabs) == 2
+    mock_run.assert_called_once()
+
+
+# Each extraction scenario is one (url, expected) pair, reported as
+# its own test case
+@pytest.mark.parametrize("url,expected", [
+    # Valid URL with assistant ID
+    ("https://dashboard.vapi.ai/call/123?assistantId=a37edc9f-852d-41b3-8601-801c20292716",
+     SAMPLE_ASSISTANT_ID),
+    # URL without assistant ID
+    ("https://google.com", None),
+    # URL with assistant ID in a different position
+    ("https://dashboard.vapi.ai?foo=bar&assistantId=a37edc9f-852d-41b3-8601-801c20292716&other=stuff",
+     SAMPLE_ASSISTANT_ID),
+    # Empty URL
+    ("", None),
+])
+def test_extract_assistant_id(vt, url, expected):
+    """Test extract_assistant_id across URL shapes"""
+    assert vt.extract_assistant_id(url) == expected
+
+
+def test_find_vapi_tabs(monkeypatch, sample_tabs, vt):
+    """Test find_vapi_tabs function"""
+    monkeypatch.setattr('vapi_transcripts.get_chrome_tabs',
+                        MagicMock(return_value=sample_tabs))
+
+    tabs = vt.find_vapi_tabs()
+
+    assert len(tabs) == 2  # Should find 2 tabs with assistant IDs
+    assert tabs[0][1] == "a37edc9f-852d-41b3-8601-801c20292716"
+    assert tabs[1][1] == "b47edc9f-852d-41b3-8601-801c20292717"
+
+
+def test_check_api_key(monkeypatch, vt):
+    """Test check_api_key function"""
+    # io.StringIO stands in for the .env file handle without the full
+    # mock_open call graph
+    monkeypatch.setattr('os.path.exists', lambda path: True)
+    monkeypatch.setattr('builtins.open',
+                        lambda *args, **kwargs: io.StringIO("VAPI_API_KEY=test_api_key"))
+
+    api_key = vt.check_api_key()
+
+    assert api_key == "test_api_key"
+
+
+def test_check_api_key_missing(monkeypatch, vt):
+    """Test check_api_key function when key is missing"""
+    monkeypatch.setattr('os.path.exists', lambda path: True)
+    monkeypatch.setattr('builtins.open',
+                        lambda *args, **kwargs: io.StringIO("NOT_A_VAPI_KEY=something"))
+
+    api_key = vt.check_api_key()
+
+    assert api_key is None
+
+
+# Platform variants of paste_from_clipboard collapsed into one
+# parametrized test; each case differs only in the platform string and
+# the subprocess outcome
+@pytest.mark.parametrize("platform,side_effect,expected", [
+    ("darwin", None, True),
+    ("darwin", OSASCRIPT_ERR, False),
+    ("linux", None, True),
+])
+def test_paste_from_clipboard(monkeypatch, vt, ok_proc, platform, side_effect, expected):
+    """Test paste_from_clipboard across platforms and outcomes"""
+    monkeypatch.setattr(sys, 'platform', platform)
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+    mock_run = MagicMock(return_value=ok_proc, side_effect=side_effect)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    assert vt.paste_from_clipboard() is expected
+    if platform == "darwin":
         mock_run.assert_called_once()
-        
-    @patch('os.path.exists')
-    @patch('os.path.join')
-    @patch('vapi_transcripts.log')  # Patch the log function
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('vapi_transcripts.run_with_venv')
-    @patch('os.remove')
-    def test_fetch_transcripts(self, mock_remove, mock_run_with_venv, mock_file, mock_log, mock_join, mock_exists):
-        """Test fetch_transcripts function"""
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_join.return_value = "/fake/path/_temp_fetch.py"
-        
-        # Mock the run_with_venv output
-        mock_run_with_venv.return_value = MagicMock(
-            stdout="Sample transcript data",
-            stderr="",
-            returncode=0
-        )
-        
-        # Call the function
-        result = fetch_transcripts("test-assistant-id", "test-api-key")
-        
-        # Verify results
-        self.assertEqual(result, "Sample transcript data")
-        mock_run_with_venv.assert_called_once()
-        self.assertTrue(mock_file.called)
-        mock_remove.assert_called_once()
-        
-    @patch('os.path.exists')
-    @patch('os.path.join')
-    @patch('vapi_transcripts.log')  # Patch the log function
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('vapi_transcripts.run_with_venv')
-    @patch('os.remove')
-    def test_fetch_transcripts_error(self, mock_remove, mock_run_with_venv, mock_file, mock_log, mock_join, mock_exists):
-        """Test fetch_transcripts function when it encounters an error"""
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_join.return_value = "/fake/path/_temp_fetch.py"
-        
-        # Mock the run_with_venv output with an error
-        mock_run_with_venv.return_value = MagicMock(
-            stdout="",
-            stderr="Error occurred",
-            returncode=1
-        )
-        
-        # Call the function
-        result = fetch_transcripts("test-assistant-id", "test-api-key")
-        
-        # Verify results
-        self.assertIsNone(result)
-        mock_run_with_venv.assert_called_once()
-        self.assertTrue(mock_file.called)
-
-    @patch('argparse.ArgumentParser.parse_args')
-    def test_parse_args(self, mock_parse_args):
-        """Test command-line argument parsing"""
-        # Create a mock args object with default values
-        mock_args = MagicMock()
-        mock_args.assistant_id = None
-        mock_args.output = None
-        mock_args.no_paste = False
-        mock_args.min_duration = 0
-        mock_args.days = None
-        mock_args.today = False
-        mock_args.limit = None
-        
-        # Set up the mock to return our mock args
-        mock_parse_args.return_value = mock_args
-        
-        # Import the function directly to avoid issues with argv
-        from vapi_transcripts import parse_args
-        
-        # Call the function
-        args = parse_args()
-        
-        # Verify the result
-        self.assertEqual(args.assistant_id, None)
-        self.assertEqual(args.output, None)
-        self.assertEqual(args.no_paste, False)
-        self.assertEqual(args.min_duration, 0)
-        self.assertEqual(args.days, None)
-        self.assertEqual(args.today, False)
-        self.assertEqual(args.limit, None)
-        
-    @patch('vapi_transcripts.fetch_transcripts')
-    @patch('vapi_transcripts.copy_to_clipboard')
-    @patch('re.match')  # Patch re.match to pass the UUID validation
-    def test_process_transcripts_with_filters(self, mock_re_match, mock_copy, mock_fetch):
-        """Test process_transcripts function with filters"""
-        # Setup mocks
-        mock_fetch.return_value = "Test transcript content"
-        mock_re_match.return_value = True  # Make the UUID validation pass
-        
-        # Call the function with various filters
-        from vapi_transcripts import process_transcripts
-        result = process_transcripts(
-            "a37edc9f-852d-41b3-8601-801c20292716", 
-            "test-api-key",
-            min_duration=60,
-            days_ago=7,
-            limit=5,
-            today_only=True
-        )
-        
-        # Verify fetch_transcripts was called with the correct arguments
-        mock_fetch.assert_called_once_with(
-            "a37edc9f-852d-41b3-8601-801c20292716", 
-            "test-api-key",
-            min_duration=60,
-            days_ago=7,
-            limit=5,
-            today_only=True
-        )
-        
-        # Verify copy_to_clipboard was called with the correct content
-        mock_copy.assert_called_once_with("Test transcript content")
-        
-        # Verify the result
-        self.assertTrue(result)
-        
-    @patch('vapi_transcripts.fetch_transcripts')
-    @patch('vapi_transcripts.log')  # Patch the log function to avoid file opening
-    @patch('re.match')  # Patch re.match to pass the UUID validation
-    def test_process_transcripts_to_file(self, mock_re_match, mock_log, mock_fetch):
-        """Test process_transcripts function with file output"""
-        # Setup mocks
-        mock_fetch.return_value = "Test transcript content"
-        mock_re_match.return_value = True  # Make the UUID validation pass
-        
-        # Patch open and os functions
-        with patch('builtins.open', new_callable=mock_open) as mock_file, \
-             patch('os.path.dirname') as mock_dirname, \
-             patch('os.path.exists') as mock_exists:
-                
-            # Set up directory mocks
-            mock_exists.return_value = True
-            mock_dirname.return_value = "/fake/path"
-            
-            # Call the function with file output
-            from vapi_transcripts import process_transcripts
-            result = process_transcripts(
-                "a37edc9f-852d-41b3-8601-801c20292716", 
-                "test-api-key",
-                output_file="test_output.md"
-            )
-            
-            # Verify fetch_transcripts was called with the correct arguments
-            mock_fetch.assert_called_once()
-            
-            # Since multiple files might be opened (for logging), check that our target file was opened correctly
-            mock_file.assert_any_call("test_output.md", 'w', encoding='utf-8')
-            
-            # Check that the content was written
-            handle = mock_file()
-            handle.write.assert_any_call("Test transcript content")
-            
-            # Verify the result
-            self.assertTrue(result)
-
-# Additional tests to improve coverage
-    @patch('vapi_transcripts.log')
-    def test_run_with_venv(self, mock_log):
-        """Test run_with_venv function"""
-        with patch('subprocess.run') as mock_run:
-            # Configure the mock
-            mock_process = MagicMock()
-            mock_process.returncode = 0
-            mock_process.stdout = "Test output"
-            mock_process.stderr = ""
-            mock_run.return_value = mock_process
-            
-            # Call the function
-            result = run_with_venv("test command")
-            
-            # Verify subprocess.run was called correctly
-            mock_run.assert_called_once()
-            args, kwargs = mock_run.call_args
-            self.assertIn("source", args[0])
-            self.assertIn("test command", args[0])
-            
-            # Verify result
-            self.assertEqual(result, mock_process)
-            
-    @patch('vapi_transcripts.check_venv_setup')
-    @patch('vapi_transcripts.check_api_key')
-    @patch('vapi_transcripts.log')
-    def test_setup_environment_success(self, mock_log, mock_check_api, mock_check_venv):
-        """Test setup_environment function success path"""
-        # Configure mocks
-        mock_check_venv.return_value = True
-        mock_check_api.return_value = "test-api-key"
-        
-        # Call the function
-        from vapi_transcripts import setup_environment
-        success, api_key = setup_environment()
-        
-        # Verify result
-        self.assertTrue(success)
-        self.assertEqual(api_key, "test-api-key")
-        
-    @patch('vapi_transcripts.check_venv_setup')
-    @patch('vapi_transcripts.log')
-    def test_setup_environment_venv_fail(self, mock_log, mock_check_venv):
-        """Test setup_environment function when venv setup fails"""
-        # Configure mock
-        mock_check_venv.return_value = False
-        
-        # Call the function
-        from vapi_transcripts import setup_environment
-        success, api_key = setup_environment()
-        
-        # Verify result
-        self.assertFalse(success)
-        self.assertIsNone(api_key)
-    @patch('os.path.exists')
-    def test_check_api_key_no_env_file(self, mock_exists):
-        """Test check_api_key function when .env file doesn't exist"""
-        mock_exists.return_value = False
-        
-        api_key = check_api_key()
-        
-        self.assertIsNone(api_key)
-        
-    @patch('vapi_transcripts.get_foreground_tab_url')  
-    @patch('vapi_transcripts.find_vapi_tabs')
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.extract_assistant_id')
-    def test_find_assistant_id_foreground(self, mock_extract, mock_log, mock_find_tabs, mock_foreground):
-        """Test find_assistant_id function with foreground tab"""
-        # Configure mocks
-        mock_foreground.return_value = "https://dashboard.vapi.ai/calls?assistantId=a37edc9f-852d-41b3-8601-801c20292716"
-        mock_extract.return_value = "a37edc9f-852d-41b3-8601-801c20292716"
-        
-        # Call function
-        from vapi_transcripts import find_assistant_id
-        result = find_assistant_id()
-        
-        # Verify result
-        self.assertEqual(result, "a37edc9f-852d-41b3-8601-801c20292716")
-        # Verify find_vapi_tabs wasn't called since foreground tab had an ID
-        mock_find_tabs.assert_not_called()
-        
-    @patch('vapi_transcripts.get_foreground_tab_url')  
-    @patch('vapi_transcripts.find_vapi_tabs')
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.extract_assistant_id')
-    def test_find_assistant_id_no_foreground(self, mock_extract, mock_log, mock_find_tabs, mock_foreground):
-        """Test find_assistant_id function when foreground tab has no assistant ID"""
-        # Configure mocks
-        mock_foreground.return_value = "https://example.com"
-        mock_extract.side_effect = [None, "a37edc9f-852d-41b3-8601-801c20292716"]
-        mock_find_tabs.return_value = [
-            ("https://dashboard.vapi.ai/calls?assistantId=a37edc9f-852d-41b3-8601-801c20292716", 
-             "a37edc9f-852d-41b3-8601-801c20292716")
-        ]
-        
-        # Call function
-        from vapi_transcripts import find_assistant_id
-        result = find_assistant_id()
-        
-        # Verify result
-        self.assertEqual(result, "a37edc9f-852d-41b3-8601-801c20292716")
-        # Verify find_vapi_tabs was called since foreground tab had no ID
-        mock_find_tabs.assert_called_once()
-        
-    @patch('vapi_transcripts.get_foreground_tab_url')  
-    @patch('vapi_transcripts.find_vapi_tabs')
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.extract_assistant_id')
-    def test_find_assistant_id_no_tabs(self, mock_extract, mock_log, mock_find_tabs, mock_foreground):
-        """Test find_assistant_id function when no tabs have assistant IDs"""
-        # Configure mocks
-        mock_foreground.return_value = "https://example.com"
-        mock_extract.return_value = None
-        mock_find_tabs.return_value = []
-        
-        # Call function
-        from vapi_transcripts import find_assistant_id
-        result = find_assistant_id()
-        
-        # Verify result
-        self.assertIsNone(result)
-    
-    @patch('vapi_transcripts.find_assistant_id')
-    @patch('vapi_transcripts.setup_environment')
-    @patch('vapi_transcripts.process_transcripts')
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.parse_args')
-    def test_main_success(self, mock_parse_args, mock_log, mock_process, mock_setup, mock_find):
-        """Test main function success path"""
-        # Configure mocks
-        mock_parse_args.return_value = MagicMock(assistant_id=None, output=None, min_duration=0, 
-                                                days=None, limit=None, today=False, no_paste=False)
-        mock_setup.return_value = (True, "test-api-key")
-        mock_find.return_value = "test-assistant-id"
-        mock_process.return_value = True
-        
-        # Call main function
-        from vapi_transcripts import main
-        result = main()
-        
-        # Verify mocks were called correctly
-        mock_setup.assert_called_once()
-        mock_find.assert_called_once()
-        mock_process.assert_called_once_with(
-            "test-assistant-id", "test-api-key", 
-            output_file=None, min_duration=0, days_ago=None, 
-            limit=None, today_only=False, no_paste=False
-        )
-        
-        # Verify result
-        self.assertEqual(result, 0)
-    
-    @patch('vapi_transcripts.find_assistant_id')
-    @patch('vapi_transcripts.setup_environment')
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.parse_args')
-    def test_main_no_assistant_id(self, mock_parse_args, mock_log, mock_setup, mock_find):
-        """Test main function when no assistant ID is found"""
-        # Configure mocks
-        mock_parse_args.return_value = MagicMock(assistant_id=None)
-        mock_setup.return_value = (True, "test-api-key")
-        mock_find.return_value = None
-        
-        # Call main function
-        from vapi_transcripts import main
-        result = main()
-        
-        # Verify result
-        self.assertEqual(result, 1)
-    
-    @patch('vapi_transcripts.log')
-    @patch('vapi_transcripts.parse_args')
-    @patch('vapi_transcripts.setup_environment')
-    def test_main_setup_fails(self, mock_setup, mock_parse_args, mock_log):
-        """Test main function when environment setup fails"""
-        # Configure mocks
-        mock_parse_args.return_value = MagicMock()
-        mock_setup.return_value = (False, None)
-        
-        # Call main function
-        from vapi_transcripts import main
-        result = main()
-        
-        # Verify result
-        self.assertEqual(result, 1)
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    else:
+        # Non-macOS paths never shell out to osascript
+        mock_run.assert_not_called()
+
+
+def test_copy_and_paste_fused(monkeypatch, vt, ok_proc):
+    """Test the single-process copy-and-paste path on macOS"""
+    monkeypatch.setattr(sys, 'platform', 'darwin')
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+    mock_run = MagicMock(return_value=ok_proc)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    assert vt.copy_and_paste("Test transcript") is True
+
+    # One osascript spawn carries both the clipboard set and the paste
+    mock_run.assert_called_once()
+    args, kwargs = mock_run.call_args
+    assert args[0][0] == 'osascript'
+    assert args[0][-1] == "Test transcript"
+
+
+def test_windows_paste_no_pyautogui(monkeypatch, vt):
+    """Test paste on Windows without pyautogui"""
+    # Direct attribute writes instead of _patch descriptor machinery
+    monkeypatch.setattr(sys, 'platform', 'win32')
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+    # Mock the ImportError for pyautogui
+    with patch('builtins.__import__', side_effect=ImportError("No module named 'pyautogui'")):
+        # Without pyautogui, it returns False on Windows
+        assert vt.paste_from_clipboard() is False
+
+
+def test_windows_paste_with_pyautogui(monkeypatch, vt):
+    """Test paste on Windows with pyautogui available"""
+    monkeypatch.setattr(sys, 'platform', 'win32')
+    # Mock pyautogui module
+    mock_pyautogui = MagicMock()
+    # Use a context manager to temporarily mock the import of pyautogui
+    with patch.dict('sys.modules', {'pyautogui': mock_pyautogui}):
+        # With pyautogui available, it returns True
+        assert vt.paste_from_clipboard() is True
+        # Verify that hotkey was called
+        mock_pyautogui.hotkey.assert_called_once_with('ctrl', 'v')
+
+
+@pytest.mark.slow
+def test_check_venv_setup_exists(patched_env, vt):
+    """Test check_venv_setup function when venv exists"""
+    # patched_env defaults already model an existing venv with a
+    # successful pip command
+    result = vt.check_venv_setup()
+
+    assert result is True
+    patched_env.exists.assert_called_once()
+    patched_env.run_with_venv.assert_called_once()
+
+
+@pytest.mark.slow
+def test_check_venv_setup_not_exists(patched_env, vt):
+    """Test check_venv_setup function when venv doesn't exist"""
+    # Mock venv directory doesn't exist; creation succeeds
+    patched_env.exists.return_value = False
+
+    result = vt.check_venv_setup()
+
+    assert result is True
+    patched_env.exists.assert_called_once()
+    patched_env.subprocess_run.assert_called_once()
+
+
+@pytest.mark.slow
+def test_fetch_transcripts(monkeypatch, vt):
+    """Test fetch_transcripts function"""
+    # The fetcher module is run directly via the venv python; only the
+    # subprocess outcome needs wiring
+    mock_run = MagicMock(return_value=SimpleNamespace(
+        stdout=b"Sample transcript data",
+        stderr=b"",
+        returncode=0
+    ))
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    # Call the function
+    result = vt.fetch_transcripts("test-assistant-id", "test-api-key")
+
+    # Verify results
+    assert result == "Sample transcript data"
+    mock_run.assert_called_once()
+    args, kwargs = mock_run.call_args
+    # Isolated-mode interpreter running the fetcher module directly
+    assert args[0][1] == '-I'
+    assert args[0][2].endswith('_vapi_fetch.py')
+    assert '--assistant-id' in args[0]
+    # The API key travels via the child environment, not the argv
+    assert kwargs['env']['VAPI_API_KEY'] == "test-api-key"
+    assert "test-api-key" not in args[0]
+
+
+@pytest.mark.slow
+def test_fetch_transcripts_error(monkeypatch, vt):
+    """Test fetch_transcripts function when it encounters an error"""
+    # The fetcher subprocess reports an error
+    mock_run = MagicMock(return_value=SimpleNamespace(
+        stdout=b"",
+        stderr=b"Error occurred",
+        returncode=1
+    ))
+    monkeypatch.setattr('subprocess.run', mock_run)
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+
+    # Call the function
+    result = vt.fetch_transcripts("test-assistant-id", "test-api-key")
+
+    # Verify results
+    assert result is None
+    mock_run.assert_called_once()
+
+
+def test_parse_args(monkeypatch, vt):
+    """Test command-line argument parsing"""
+    # A plain namespace models the parsed-args object
+    mock_args = SimpleNamespace(assistant_id=None, output=None,
+                                no_paste=False, min_duration=0, days=None,
+                                today=False, limit=None)
+    monkeypatch.setattr('argparse.ArgumentParser.parse_args',
+                        MagicMock(return_value=mock_args))
+
+    # Call the function
+    args = vt.parse_args()
+
+    # Verify the result
+    assert args.assistant_id is None
+    assert args.output is None
+    assert args.no_paste is False
+    assert args.min_duration == 0
+    assert args.days is None
+    assert args.today is False
+    assert args.limit is None
+
+
+def test_process_transcripts_with_filters(monkeypatch, vt):
+    """Test process_transcripts function with filters"""
+    # Setup mocks; the sample ID is a real UUID so the production
+    # validation runs for real instead of being mocked out
+    mock_fetch = MagicMock(return_value="Test transcript content")
+    mock_copy = MagicMock()
+    monkeypatch.setattr('vapi_transcripts.fetch_transcripts', mock_fetch)
+    monkeypatch.setattr('vapi_transcripts.copy_to_clipboard', mock_copy)
+
+    # Call the function with various filters
+    result = vt.process_transcripts(
+        SAMPLE_ASSISTANT_ID,
+        "test-api-key",
+        min_duration=60,
+        days_ago=7,
+        limit=5,
+        today_only=True
+    )
+
+    # Verify fetch_transcripts was called with the correct arguments
+    assert mock_fetch.call_count == 1
+    assert mock_fetch.call_args == EXPECTED_FETCH_CALL
+
+    # Verify copy_to_clipboard was called with the correct content
+    mock_copy.assert_called_once_with("Test transcript content")
+
+    # Verify the result
+    assert result is True
+
+
+def test_process_transcripts_to_file(monkeypatch, vt):
+    """Test process_transcripts function with file output"""
+    # File output streams via the dedicated function; the buffered
+    # fetch-to-string path must not run at all
+    mock_fetch_to_file = MagicMock(return_value=True)
+    mock_fetch = MagicMock()
+    monkeypatch.setattr('vapi_transcripts.fetch_transcripts_to_file',
+                        mock_fetch_to_file)
+    monkeypatch.setattr('vapi_transcripts.fetch_transcripts', mock_fetch)
+    monkeypatch.setattr('os.path.dirname', lambda path: "/fake/path")
+    monkeypatch.setattr('os.makedirs', MagicMock())
+
+    # Call the function with file output
+    result = vt.process_transcripts(
+        SAMPLE_ASSISTANT_ID,
+        "test-api-key",
+        output_file="test_output.md"
+    )
+
+    # Verify the streaming path was taken with the target file
+    mock_fetch_to_file.assert_called_once()
+    args, kwargs = mock_fetch_to_file.call_args
+    assert args[2] == "test_output.md"
+    mock_fetch.assert_not_called()
+
+    # Verify the result
+    assert result is True
+
+
+@pytest.mark.slow
+def test_fetch_transcripts_to_file(monkeypatch, vt):
+    """Test fetch_transcripts_to_file streams stdout into the file"""
+    mock_run = MagicMock(return_value=SimpleNamespace(
+        stdout=None,
+        stderr=b"",
+        returncode=0
+    ))
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    # close() is a no-op so attributes stay inspectable after the
+    # with-block
+    class _KeepOpenBuffer(io.BytesIO):
+        def close(self):
+            pass
+
+    buffer = _KeepOpenBuffer()
+    opened = []
+
+    def fake_open(path, *args, **kwargs):
+        opened.append((path, args))
+        return buffer
+
+    monkeypatch.setattr('builtins.open', fake_open)
+
+    result = vt.fetch_transcripts_to_file("test-assistant-id",
+                                          "test-api-key", "out.md")
+
+    assert result is True
+    # The file is opened in binary mode and handed to the child as
+    # stdout, so the transcript never passes through this process
+    assert opened == [("out.md", ('wb',))]
+    args, kwargs = mock_run.call_args
+    assert kwargs['stdout'] is buffer
+    assert kwargs['env']['VAPI_API_KEY'] == "test-api-key"
+
+
+def test_run_with_venv(monkeypatch, vt):
+    """Test run_with_venv function"""
+    # Configure the mock
+    mock_process = SimpleNamespace(stdout="Test output", stderr="",
+                                   returncode=0)
+    mock_run = MagicMock(return_value=mock_process)
+    monkeypatch.setattr('subprocess.run', mock_run)
+
+    # Call the function
+    result = vt.run_with_venv("test command")
+
+    # Verify subprocess.run was called correctly
+    mock_run.assert_called_once()
+    args, kwargs = mock_run.call_args
+    assert "source" in args[0]
+    assert "test command" in args[0]
+
+    # Verify result
+    assert result == mock_process
+
+
+def test_setup_environment_success(monkeypatch, patched_env, vt):
+    """Test setup_environment function success path"""
+    # Configure mocks
+    monkeypatch.setattr('vapi_transcripts.check_venv_setup',
+                        MagicMock(return_value=True))
+    monkeypatch.setattr('vapi_transcripts.check_api_key',
+                        MagicMock(return_value="test-api-key"))
+
+    # Call the function
+    success, api_key = vt.setup_environment()
+
+    # Verify result
+    assert success is True
+    assert api_key == "test-api-key"
+
+
+def test_setup_environment_venv_fail(monkeypatch, patched_env, vt):
+    """Test setup_environment function when venv setup fails"""
+    # Configure mocks; check_api_key runs concurrently with the venv
+    # check, so it needs a stub even on the failure path
+    monkeypatch.setattr('vapi_transcripts.check_venv_setup',
+                        MagicMock(return_value=False))
+    monkeypatch.setattr('vapi_transcripts.check_api_key',
+                        MagicMock(return_value=None))
+
+    # Call the function
+    success, api_key = vt.setup_environment()
+
+    # Verify result
+    assert success is False
+    assert api_key is None
+
+
+def test_check_api_key_no_env_file(monkeypatch, vt):
+    """Test check_api_key function when .env file doesn't exist"""
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+
+    api_key = vt.check_api_key()
+
+    assert api_key is None
+
+
+# The find_assistant_id scenarios differ only in what the foreground
+# tab and the tab scan return, so they share one mock graph
+@pytest.mark.parametrize("foreground_url,extract_results,vapi_tabs,expected,expected_scans", [
+    # Foreground tab carries the ID; the tab scan is never needed
+    ("https://dashboard.vapi.ai/calls?assistantId=a37edc9f-852d-41b3-8601-801c20292716",
+     [SAMPLE_ASSISTANT_ID], None, SAMPLE_ASSISTANT_ID, 0),
+    # Foreground tab has no ID; the scan finds one
+    ("https://example.com", [None, SAMPLE_ASSISTANT_ID],
+     [("https://dashboard.vapi.ai/calls?assistantId=a37edc9f-852d-41b3-8601-801c20292716",
+       SAMPLE_ASSISTANT_ID)],
+     SAMPLE_ASSISTANT_ID, 1),
+    # Nothing anywhere; the filtered scan misses, then the unfiltered
+    # rescan also comes up empty
+    ("https://example.com", [None], [], None, 2),
+])
+def test_find_assistant_id(monkeypatch, vt, foreground_url, extract_results,
+                           vapi_tabs, expected, expected_scans):
+    """Test find_assistant_id across foreground/tab-scan outcomes"""
+    mock_find_tabs = MagicMock(return_value=vapi_tabs or [])
+    monkeypatch.setattr('vapi_transcripts.get_chrome_state',
+                        MagicMock(return_value=(foreground_url, [])))
+    monkeypatch.setattr('vapi_transcripts.extract_assistant_id',
+                        MagicMock(side_effect=extract_results * 2))
+    monkeypatch.setattr('vapi_transcripts.find_vapi_tabs', mock_find_tabs)
+
+    result = vt.find_assistant_id()
+
+    assert result == expected
+    assert mock_find_tabs.call_count == expected_scans
+
+
+@pytest.mark.slow
+def test_main_success(monkeypatch, vt):
+    """Test main function success path"""
+    # Configure mocks
+    mock_setup = MagicMock(return_value=(True, "test-api-key"))
+    mock_find = MagicMock(return_value="test-assistant-id")
+    mock_process = MagicMock(return_value=True)
+    monkeypatch.setattr('vapi_transcripts.parse_args', MagicMock(
+        return_value=SimpleNamespace(
+            assistant_id=None, output=None, min_duration=0,
+            days=None, limit=None, today=False, no_paste=False)))
+    monkeypatch.setattr('vapi_transcripts.setup_environment', mock_setup)
+    monkeypatch.setattr('vapi_transcripts.find_assistant_id', mock_find)
+    monkeypatch.setattr('vapi_transcripts.process_transcripts', mock_process)
+
+    # Call main function
+    result = vt.main()
+
+    # Verify mocks were called correctly
+    mock_setup.assert_called_once()
+    mock_find.assert_called_once()
+    assert mock_process.call_count == 1
+    assert mock_process.call_args == EXPECTED_PROCESS_CALL
+
+    # Verify result
+    assert result == 0
+
+
+@pytest.mark.slow
+def test_main_uses_cached_assistant(monkeypatch, vt):
+    """Test that a warm assistant-ID cache skips the Chrome scan"""
+    mock_find = MagicMock()
+    mock_process = MagicMock(return_value=True)
+    monkeypatch.setattr('vapi_transcripts.parse_args', MagicMock(
+        return_value=SimpleNamespace(
+            assistant_id=None, output=None, min_duration=0,
+            days=None, limit=None, today=False, no_paste=False)))
+    monkeypatch.setattr('vapi_transcripts.setup_environment',
+                        MagicMock(return_value=(True, "test-api-key")))
+    monkeypatch.setattr('vapi_transcripts._load_cached_assistant',
+                        MagicMock(return_value="cached-assistant-id"))
+    monkeypatch.setattr('vapi_transcripts.find_assistant_id', mock_find)
+    monkeypatch.setattr('vapi_transcripts.process_transcripts', mock_process)
+
+    result = vt.main()
+
+    assert result == 0
+    # The cached ID is used directly; no osascript-backed scan runs
+    mock_find.assert_not_called()
+    assert mock_process.call_args[0][0] == "cached-assistant-id"
+
+
+@pytest.mark.slow
+def test_main_no_assistant_id(monkeypatch, vt):
+    """Test main function when no assistant ID is found"""
+    # Configure mocks
+    monkeypatch.setattr('vapi_transcripts.parse_args',
+                        MagicMock(return_value=SimpleNamespace(assistant_id=None)))
+    monkeypatch.setattr('vapi_transcripts.setup_environment',
+                        MagicMock(return_value=(True, "test-api-key")))
+    monkeypatch.setattr('vapi_transcripts.find_assistant_id',
+                        MagicMock(return_value=None))
+
+    # Call main function
+    result = vt.main()
+
+    # Verify result
+    assert result == 1
+
+
+@pytest.mark.slow
+def test_main_setup_fails(monkeypatch, vt):
+    """Test main function when environment setup fails"""
+    # Configure mocks
+    monkeypatch.setattr('vapi_transcripts.parse_args',
+                        MagicMock(return_value=SimpleNamespace(assistant_id=None)))
+    monkeypatch.setattr('vapi_transcripts.setup_environment',
+                        MagicMock(return_value=(False, None)))
+
+    # Call main function
+    result = vt.main()
+
+    # Verify result
+    assert result == 1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared preamble for the VAPI diagnostic scripts.
+
+examine_call.py, test_api.py, test_call_fetch.py, and
+test_call_metadata.py used to copy-paste ~25 lines of setup each.
+Importing this module instead means the .env parse, the SDK import
+check, and the client construction all happen once per process, no
+matter how many of the scripts end up imported together.
+"""
+
+import sys
+from typing import Optional
+
+from vapi_env import SCRIPT_DIR, load_env, load_api_key
+
+# Parsed once per process thanks to the lru_cache in vapi_env
+API_KEY = load_api_key()
+
+# Import the SDK if it is available; get_client() reports the failure
+# with setup instructions only when a script actually needs it
+try:
+    from vapi import Vapi
+except ImportError:
+    Vapi = None
+
+# Process-wide VAPI client so every caller shares one connection pool
+_client = None
+
+
+def require_api_key() -> str:
+    """
+    Return the API key, exiting with setup instructions if it is missing.
+
+    Returns:
+        The API key from the .env file
+    """
+    if not API_KEY:
+        print("Error: VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
+        sys.exit(1)
+    return API_KEY
+
+
+def get_client() -> "Vapi":
+    """
+    Get (or lazily create) the shared VAPI client.
+
+    Returns:
+        The process-wide Vapi client instance
+    """
+    global _client
+    if _client is None:
+        if Vapi is None:
+            print("Error: VAPI SDK not found. Please run:")
+            print(f"cd {SCRIPT_DIR} && python3 -m venv venv && source venv/bin/activate && pip install vapi_server_sdk")
+            sys.exit(1)
+        _client = Vapi(token=require_api_key())
+    return _client
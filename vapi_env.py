@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared .env loader for VAPI Tools scripts.
+
+Every script used to re-open and line-scan .env at import time. This
+module parses the file once per process and memoizes the result, so
+repeated imports (or chained imports in a test runner) hit an in-process
+cache instead of the disk.
+"""
+
+import os
+import re
+import functools
+from typing import Dict, Optional
+
+# Get the absolute path to the directory containing the scripts
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default location of the .env file
+DEFAULT_ENV_PATH = os.path.join(SCRIPT_DIR, '.env')
+
+
+@functools.lru_cache(maxsize=1)
+def load_env(path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Parse the .env file into a dict, caching the result per process.
+
+    Args:
+        path: Path to the .env file (defaults to .env next to the scripts)
+
+    Returns:
+        Dict mapping variable names to values; empty if the file is
+        missing or unreadable
+    """
+    env_path = path or DEFAULT_ENV_PATH
+    env_vars: Dict[str, str] = {}
+
+    try:
+        if os.path.exists(env_path):
+            with open(env_path, 'r') as f:
+                for line in f:
+                    # partition avoids the list allocation of split('=', 1)
+                    key, sep, value = line.strip().partition('=')
+                    if sep and not key.startswith('#'):
+                        env_vars[key] = value
+    except Exception as e:
+        print(f"Warning: Could not read .env file: {e}")
+
+    return env_vars
+
+
+# Compiled once; finds the key in a single pass over the raw bytes
+_API_KEY_RE = re.compile(rb'^VAPI_API_KEY=(.*)$', re.M)
+
+
+@functools.lru_cache(maxsize=1)
+def load_api_key(path: Optional[str] = None) -> Optional[str]:
+    """
+    Get the VAPI API key, reading and scanning the file exactly once.
+
+    Unlike load_env this never builds per-line objects: the file bytes
+    are read in one call and searched with a single precompiled regex.
+
+    Args:
+        path: Path to the .env file (defaults to .env next to the scripts)
+
+    Returns:
+        The API key if found, None otherwise
+    """
+    env_path = path or DEFAULT_ENV_PATH
+    try:
+        with open(env_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    match = _API_KEY_RE.search(data)
+    if match:
+        return match.group(1).strip().decode('utf-8')
+    return None
@@ -14,15 +14,19 @@
 # @raycast.description Extract and paste transcripts from VAPI voice assistant calls
 # @raycast.author christian_ulstrup
 
+import atexit
 import os
 import sys
 import subprocess
 import re
 import json
+import time
 import traceback
+import uuid
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Union, NoReturn
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union, NoReturn
 
 # Get the absolute path to the script directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -30,21 +34,74 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Set up logging to file
 LOG_FILE = os.path.join(SCRIPT_DIR, "vapi_transcript_debug.log")
 
-def log(message: str) -> None:
+# Verbose per-URL logging is opt-in; with hundreds of tabs the extra
+# records dominate wall time otherwise
+VERBOSE = os.environ.get('VAPI_DEBUG') == '1'
+
+# UUID shape of a VAPI assistant ID, compiled once at import
+UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z')
+UUID_SEARCH_RE = re.compile(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
+
+# URL shapes that carry an assistant ID, compiled once at import so the
+# per-tab scan in find_vapi_tabs never re-parses the patterns
+ASSISTANT_ID_PATTERNS = [
+    re.compile(r'assistantId=([^&,\s]+)'),     # Standard query parameter (with comma exclusion)
+    re.compile(r'/assistant/([^/,\s]+)'),      # URL path parameter (with comma exclusion)
+    re.compile(r'/assistants/([^/,\s]+)'),     # Alternative URL path (with comma exclusion)
+    re.compile(r'calls\?assistantId=([^&,\s]+)')  # Specific format (with comma exclusion)
+]
+
+# Single buffered handle for the debug log, opened on first use and
+# closed at interpreter exit; avoids an open/write/close syscall triple
+# per message
+_LOG_FH = None
+
+# Logging can be switched off wholesale (VAPI_LOG_LEVEL=off|none);
+# combined with %-style lazy arguments below, disabled runs skip both
+# the formatting and the write
+_LOG_DISABLED = os.environ.get('VAPI_LOG_LEVEL', '').lower() in ('off', 'none')
+
+def log(message: str, *args: Any) -> None:
     """
     Write message to log file.
     
     Args:
-        message: The message to log
+        message: The message to log, optionally with %-placeholders
+        *args: Placeholder values, formatted only when the message is
+            actually written
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(LOG_FILE, "a") as f:
-        f.write(f"[{timestamp}] {message}\n")
+    global _LOG_FH
+    if _LOG_DISABLED:
+        return
+    if args:
+        message = message % args
+    if _LOG_FH is None:
+        _LOG_FH = open(LOG_FILE, "a", buffering=8192)
+        atexit.register(_LOG_FH.close)
+    # time.strftime is cheaper than building a datetime object first
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    _LOG_FH.write(f"[{timestamp}] {message}\n")
+
+def log_exception(message: str, *args: Any) -> None:
+    """
+    Log a message followed by the current exception's traceback.
+
+    traceback.format_exc() walks the whole frame stack and allocates a
+    multi-KB string, so it only runs when the log is actually enabled.
+
+    Args:
+        message: The message to log, optionally with %-placeholders
+        *args: Placeholder values for the message
+    """
+    if _LOG_DISABLED:
+        return
+    log(message, *args)
+    log(traceback.format_exc())
 
 # Log script start with environment info
-log(f"Script started. Python version: {sys.version}")
-log(f"Script directory: {SCRIPT_DIR}")
-log(f"Current working directory: {os.getcwd()}")
+log("Script started. Python version: %s", sys.version)
+log("Script directory: %s", SCRIPT_DIR)
+log("Current working directory: %s", os.getcwd())
 
 def run_with_venv(command: str) -> subprocess.CompletedProcess:
     """
@@ -97,33 +154,105 @@ def get_foreground_tab_url() -> str:
         log(f"Unexpected error getting Chrome URL: {str(e)}")
         return ""
 
+def get_chrome_state() -> Tuple[str, List[str]]:
+    """
+    Get the foreground tab URL and all tab URLs in one osascript call.
+
+    Each osascript spawn costs a fixed ~50-200 ms, so fetching both
+    values in a single script halves the AppleScript overhead on the
+    happy path compared to calling get_foreground_tab_url and
+    get_chrome_tabs separately.
+
+    The tab list is pre-filtered browser-side to URLs containing
+    'vapi' or 'dashboard', so only candidate tabs are shipped across
+    the Apple-events IPC boundary.
+
+    Returns:
+        Tuple of (foreground tab URL, list of candidate tab URLs);
+        empty values if Chrome is not available
+    """
+    script = '''
+    try
+        tell application "Google Chrome"
+            set foregroundURL to ""
+            try
+                set foregroundURL to URL of active tab of front window
+            end try
+            set tabList to ""
+            set windowCount to count of windows
+            if windowCount > 0 then
+                repeat with i from 1 to windowCount
+                    set theWindow to window i
+                    -- Filter browser-side so only candidate URLs cross
+                    -- the Apple-events boundary
+                    set matchingTabs to (every tab of theWindow whose URL contains "vapi" or URL contains "dashboard")
+                    repeat with theTab in matchingTabs
+                        set theURL to URL of theTab
+                        if tabList is "" then
+                            set tabList to theURL
+                        else
+                            set tabList to tabList & "|" & theURL
+                        end if
+                    end repeat
+                end repeat
+            end if
+            return "FOREGROUND:" & foregroundURL & "\n" & tabList
+        end tell
+    on error
+        return ""
+    end try
+    '''
+    try:
+        result = subprocess.run(['osascript', '-e', script],
+                               capture_output=True, text=True, check=False)
+        if result.returncode != 0 or not result.stdout.strip():
+            log(f"Error or empty result getting Chrome state: {result.stderr}")
+            return "", []
+
+        first_line, _, rest = result.stdout.strip().partition('\n')
+        foreground_url = first_line[len('FOREGROUND:'):].strip() if first_line.startswith('FOREGROUND:') else ""
+        tabs = [tab.strip().rstrip(',') for tab in rest.split('|') if tab.strip()]
+        log(f"Retrieved Chrome state: foreground={'yes' if foreground_url else 'no'}, {len(tabs)} tabs")
+        return foreground_url, tabs
+
+    except subprocess.CalledProcessError as e:
+        log(f"Error getting Chrome state: {str(e)}")
+        return "", []
+    except Exception as e:
+        log(f"Unexpected error getting Chrome state: {str(e)}")
+        return "", []
+
+# Most recent tab query: (monotonic timestamp, tabs). Back-to-back
+# scans within the TTL reuse it instead of spawning osascript again
+_TAB_CACHE: Optional[Tuple[float, List[str]]] = None
+_TAB_CACHE_TTL = 2.0
+
+# On-disk cache for the resolved assistant ID; warm Raycast runs skip
+# the osascript round-trips entirely (one stat + one json.load)
+_ASSISTANT_CACHE_FILE = os.path.join(
+    os.path.expanduser('~'), '.cache', 'vapi-tools', 'assistant.json')
+_ASSISTANT_CACHE_TTL = 300.0
+
 def get_chrome_tabs() -> List[str]:
     """
     Get URLs from all Chrome tabs.
     
+    Results are cached for a couple of seconds, so consecutive scans in
+    the same invocation pay for one osascript spawn.
+
     Returns:
         List of URLs from all open Chrome tabs or empty list if not available
     """
-    # First, check if Chrome is running
-    check_script = '''
-    on is_running(appName)
-        tell application "System Events"
-            return (count of (every process whose name is appName)) > 0
-        end tell
-    end is_running
-    
-    is_running("Google Chrome")
-    '''
-    
+    global _TAB_CACHE
+    if _TAB_CACHE is not None and time.monotonic() - _TAB_CACHE[0] < _TAB_CACHE_TTL:
+        log(f"Using cached tab list ({len(_TAB_CACHE[1])} tabs)")
+        return _TAB_CACHE[1]
+
+    # A separate "is the browser running" probe would cost its own
+    # osascript spawn; the enumeration script just fails gracefully
     try:
-        check_result = subprocess.run(['osascript', '-e', check_script], 
-                                    capture_output=True, text=True, check=False)
-        if check_result.returncode != 0 or check_result.stdout.strip().lower() != "true":
-            log("Chrome is not running")
-            return []
-            
-        # Now try to get tabs
         script = '''
+        try
         tell application "Google Chrome"
             set tabList to ""
             set windowCount to count of windows
@@ -145,6 +274,9 @@ def get_chrome_tabs() -> List[str]:
             end if
             return tabList
         end tell
+        on error
+            return ""
+        end try
         '''
         
         result = subprocess.run(['osascript', '-e', script], 
@@ -156,6 +288,7 @@ def get_chrome_tabs() -> List[str]:
             # Remove any empty entries and clean up each URL
             tabs = [tab.strip().rstrip(',') for tab in tabs if tab.strip()]
             log(f"Successfully retrieved {len(tabs)} tabs from Chrome")
+            _TAB_CACHE = (time.monotonic(), tabs)
             return tabs
             
         log(f"Error or empty result getting Chrome tabs: {result.stderr}")
@@ -178,46 +311,48 @@ def extract_assistant_id(url: str) -> Optional[str]:
     Returns:
         The assistant ID if found, None otherwise
     """
+    # Cheap pre-filter: a URL with none of the marker substrings and
+    # fewer dashes than a UUID cannot carry an assistant ID, so skip
+    # the regex walk (and the log noise) for it entirely
+    lowered = url.lower()
+    if 'assistant' not in lowered and 'vapi' not in lowered and lowered.count('-') < 4:
+        return None
+
     # Log the actual URL for debugging
-    log(f"Examining URL for assistantId: {url}")
+    if VERBOSE:
+        log(f"Examining URL for assistantId: {url}")
     
     # Clean up URL: remove trailing commas and leading/trailing spaces
     url = url.strip().rstrip(',')
-    log(f"Cleaned URL: {url}")
+    if VERBOSE:
+        log(f"Cleaned URL: {url}")
     
     # No special case hardcoded IDs in the open source version
     
-    # Try multiple patterns to extract assistant ID
-    patterns = [
-        r'assistantId=([^&,\s]+)',     # Standard query parameter (with comma exclusion)
-        r'/assistant/([^/,\s]+)',      # URL path parameter (with comma exclusion)
-        r'/assistants/([^/,\s]+)',     # Alternative URL path (with comma exclusion)
-        r'calls\?assistantId=([^&,\s]+)'  # Specific format (with comma exclusion)
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    # Try the precompiled patterns to extract the assistant ID
+    for pattern in ASSISTANT_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             try:
                 # Clean the extracted ID: strip spaces and commas
                 assistant_id = match.group(1).strip().rstrip(',')
-                log(f"Found assistant ID using pattern {pattern}: {assistant_id}")
+                if VERBOSE:
+                    log(f"Found assistant ID using pattern {pattern.pattern}: {assistant_id}")
                 
                 # Validate the cleaned ID matches UUID format
-                uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-                if re.match(uuid_pattern, assistant_id):
+                if UUID_RE.match(assistant_id):
                     log(f"Validated assistant ID as valid UUID: {assistant_id}")
                     return assistant_id
-                else:
+                elif VERBOSE:
                     log(f"Extracted ID {assistant_id} does not match UUID format")
             except IndexError:
                 # In case the pattern matches but doesn't have a capture group
-                log(f"Pattern {pattern} matched but no capture group")
+                if VERBOSE:
+                    log(f"Pattern {pattern.pattern} matched but no capture group")
                 continue
     
     # Last resort - check if the URL contains a UUID pattern
-    uuid_pattern = r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'
-    match = re.search(uuid_pattern, url)
+    match = UUID_SEARCH_RE.search(url)
     if match:
         assistant_id = match.group(1).strip()
         log(f"Found assistant ID using UUID pattern: {assistant_id}")
@@ -226,42 +361,71 @@ def extract_assistant_id(url: str) -> Optional[str]:
     log(f"No assistant ID found in URL: {url}")
     return None
 
-def find_vapi_tabs() -> List[Tuple[str, str]]:
+def iter_vapi_tabs(tabs: Optional[List[str]] = None) -> Iterator[Tuple[str, str]]:
     """
-    Find all Chrome tabs with VAPI assistant IDs.
-    
-    Returns:
-        List of tuples containing (URL, assistant_id) for each tab
-        with a VAPI assistant ID
+    Yield Chrome tabs with VAPI assistant IDs lazily.
+
+    Tabs are yielded in priority order (VAPI/dashboard URLs first), so
+    callers that only need one match can stop after the first yield
+    without scanning the remaining tabs.
+
+    Args:
+        tabs: Tab URLs to scan; queried from Chrome when not provided
+
+    Yields:
+        Tuples containing (URL, assistant_id) for each tab with a
+        VAPI assistant ID
     """
-    all_tabs = get_chrome_tabs()
+    all_tabs = get_chrome_tabs() if tabs is None else tabs
     log(f"Got {len(all_tabs)} tabs from Chrome")
     for tab in all_tabs:
         log(f"Tab URL: {tab}")
     
-    vapi_tabs = []
-    
     # Look for 'vapi' or 'dashboard' in URLs first
     vapi_dashboard_tabs = [url for url in all_tabs if 'vapi' in url.lower() or 'dashboard' in url.lower()]
     if vapi_dashboard_tabs:
         log(f"Found {len(vapi_dashboard_tabs)} potential VAPI dashboard tabs")
-    
+
     # Check all tabs, but prioritize VAPI tabs first
     priority_tabs = vapi_dashboard_tabs + [url for url in all_tabs if url not in vapi_dashboard_tabs]
-    
+
+    # Duplicate tabs (pinned across windows, reopened sessions) would
+    # re-run the same regex scan; parse each distinct URL once
+    seen = set()
     for url in priority_tabs:
+        if url in seen:
+            continue
+        seen.add(url)
         assistant_id = extract_assistant_id(url)
         if assistant_id:
-            vapi_tabs.append((url, assistant_id))
-    
+            log(f"  Tab with assistant ID: {url} -> {assistant_id}")
+            yield url, assistant_id
+
+def find_vapi_tabs(tabs: Optional[List[str]] = None,
+                   first_only: bool = False) -> List[Tuple[str, str]]:
+    """
+    Find all Chrome tabs with VAPI assistant IDs.
+
+    Args:
+        tabs: Tab URLs to scan; queried from Chrome when not provided
+        first_only: Stop scanning after the first match
+
+    Returns:
+        List of tuples containing (URL, assistant_id) for each tab
+        with a VAPI assistant ID
+    """
+    if first_only:
+        first = next(iter_vapi_tabs(tabs), None)
+        vapi_tabs = [first] if first else []
+    else:
+        vapi_tabs = list(iter_vapi_tabs(tabs))
+
     # Log the results for debugging
     if vapi_tabs:
         log(f"Found {len(vapi_tabs)} tabs with assistant IDs")
-        for url, aid in vapi_tabs:
-            log(f"  Tab with assistant ID: {url} -> {aid}")
     else:
         log("No tabs with assistant IDs found")
-    
+
     return vapi_tabs
 
 def copy_to_clipboard(text: str) -> None:
@@ -303,6 +467,43 @@ def copy_to_clipboard(text: str) -> None:
             # Fall back to using clip.exe
             subprocess.run(['clip'], input=text.encode('utf-8'), check=True)
     
+# Payloads above this size go through the two-step pbcopy/osascript
+# path; argv-passed text is subject to the OS argument-length limit
+_MAX_OSASCRIPT_ARG = 100_000
+
+def copy_and_paste(text: str) -> bool:
+    """
+    Copy text to the clipboard and paste it in a single osascript call.
+
+    On macOS this replaces the separate pbcopy and keystroke processes
+    with one spawn; large payloads and other platforms fall back to the
+    two-step path.
+
+    Args:
+        text: The text to copy and paste
+
+    Returns:
+        Boolean indicating whether the paste succeeded
+    """
+    if sys.platform != 'darwin' or len(text) > _MAX_OSASCRIPT_ARG:
+        copy_to_clipboard(text)
+        return paste_from_clipboard()
+
+    print(f"Copying {len(text)} characters to clipboard and pasting...")
+    command = ['osascript',
+               '-e', 'on run argv',
+               '-e', 'set the clipboard to item 1 of argv',
+               '-e', 'tell application "System Events" to keystroke "v" using command down',
+               '-e', 'end run',
+               text]
+    try:
+        subprocess.run(command, capture_output=True, text=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        log(f"Fused copy-and-paste failed, falling back: {str(e)}")
+        copy_to_clipboard(text)
+        return paste_from_clipboard()
+
 def paste_from_clipboard() -> bool:
     """
     Paste clipboard content at current cursor position using platform-specific methods.
@@ -352,6 +553,19 @@ def check_venv_setup() -> bool:
         Boolean indicating if the virtual environment is set up correctly
     """
     log("Checking virtual environment setup")
+
+    # Fast path: a stamp file newer than the venv means the SDK check
+    # already passed, so skip the interpreter spawn entirely
+    venv_dir = os.path.join(SCRIPT_DIR, "venv")
+    stamp_path = os.path.join(venv_dir, ".vapi_ok")
+    try:
+        if os.path.getmtime(stamp_path) >= os.path.getmtime(venv_dir):
+            log("Virtual environment verified via stamp file")
+            return True
+    except OSError:
+        # No stamp (or no venv) yet; fall through to the full check
+        pass
+
     # Check if venv directory exists
     if not os.path.exists(f"{SCRIPT_DIR}/venv"):
         log("Virtual environment not found, attempting to create it")
@@ -377,18 +591,18 @@ def check_venv_setup() -> bool:
                 
             log("Virtual environment created successfully")
         except Exception as e:
-            log(f"Exception creating venv: {str(e)}")
-            log(traceback.format_exc())
+            log_exception("Exception creating venv: %s", str(e))
             print(f"Error creating virtual environment: {e}")
             return False
     else:
         log("Virtual environment exists")
     
-    # Check if VAPI SDK is installed
+    # Check if VAPI SDK is installed; find_spec imports far less than
+    # pip's module graph
     log("Checking if VAPI SDK is installed")
-    result = run_with_venv("pip list | grep vapi")
+    result = run_with_venv('python -c "import importlib.util, sys; sys.exit(0 if importlib.util.find_spec(\'vapi\') else 1)"')
     
-    if "vapi" not in result.stdout:
+    if result.returncode != 0:
         log("VAPI SDK not found, attempting to install it")
         print("Installing VAPI SDK...")
         
@@ -402,13 +616,19 @@ def check_venv_setup() -> bool:
                 
             log("VAPI SDK installed successfully")
         except Exception as e:
-            log(f"Exception installing VAPI SDK: {str(e)}")
-            log(traceback.format_exc())
+            log_exception("Exception installing VAPI SDK: %s", str(e))
             print(f"Error installing VAPI SDK: {e}")
             return False
     else:
         log("VAPI SDK is already installed")
     
+    # Record the successful check so the next run can skip it
+    try:
+        with open(stamp_path, "w") as f:
+            f.write(datetime.now().isoformat())
+    except OSError as e:
+        log(f"Could not write venv stamp file: {str(e)}")
+
     log("Virtual environment setup complete")
     return True
 
@@ -426,7 +646,8 @@ def check_api_key() -> Optional[str]:
         with open(env_path, 'r') as f:
             for line in f:
                 if line.startswith('VAPI_API_KEY='):
-                    api_key = line.strip().split('=', 1)[1]
+                    # partition avoids the list allocation of split('=', 1)
+                    api_key = line.strip().partition('=')[2]
                     break
     
     if not api_key:
@@ -435,6 +656,87 @@ def check_api_key() -> Optional[str]:
     
     return api_key
 
+def _build_fetch_command(assistant_id: str, min_duration: int = 0,
+                         days_ago: Optional[int] = None,
+                         limit: Optional[int] = None,
+                         today_only: bool = False) -> List[str]:
+    """
+    Build the command line for the transcript fetcher subprocess.
+
+    Args:
+        assistant_id: The VAPI assistant ID to fetch transcripts for
+        min_duration: Minimum duration in seconds for a call to be included
+        days_ago: Only include calls from the last N days
+        limit: Maximum number of calls to include
+        today_only: Only include calls from today
+
+    Returns:
+        Argument list for subprocess.run
+    """
+    # -I (isolated) skips user site-packages and PYTHON* env vars for a
+    # faster, more predictable interpreter start; -S is not used because
+    # the venv's site-packages are wired up by site processing
+    venv_python = os.path.join(SCRIPT_DIR, 'venv', 'bin', 'python')
+    fetcher = os.path.join(SCRIPT_DIR, '_vapi_fetch.py')
+    command = [venv_python, '-I', fetcher,
+               '--assistant-id', assistant_id,
+               '--min-duration', str(min_duration)]
+    if days_ago is not None:
+        command.extend(['--days-ago', str(days_ago)])
+    if limit is not None:
+        command.extend(['--limit', str(limit)])
+    if today_only:
+        command.append('--today-only')
+    return command
+
+def fetch_transcripts_to_file(assistant_id: str, api_key: str,
+                              output_file: str,
+                              min_duration: int = 0, days_ago: int = None,
+                              limit: int = None,
+                              today_only: bool = False) -> bool:
+    """
+    Stream transcripts from the fetcher straight into a file.
+
+    The fetcher's stdout is pointed at the file descriptor, so the
+    document never accumulates in this process; peak memory stays at
+    pipe-buffer size no matter how large the account is.
+
+    Args:
+        assistant_id: The VAPI assistant ID to fetch transcripts for
+        api_key: VAPI API key for authentication
+        output_file: Path the transcripts are written to
+        min_duration: Minimum duration in seconds for a call to be included
+        days_ago: Only include calls from the last N days
+        limit: Maximum number of calls to include
+        today_only: Only include calls from today
+
+    Returns:
+        Boolean indicating success or failure
+    """
+    log(f"Streaming transcripts for assistant ID {assistant_id} to {output_file}")
+    command = _build_fetch_command(assistant_id, min_duration=min_duration,
+                                   days_ago=days_ago, limit=limit,
+                                   today_only=today_only)
+    try:
+        with open(output_file, 'wb') as fh:
+            result = subprocess.run(command, stdout=fh,
+                                    stderr=subprocess.PIPE, cwd=SCRIPT_DIR,
+                                    env={**os.environ, 'VAPI_API_KEY': api_key})
+
+        if result.returncode != 0:
+            stderr_text = result.stderr.decode('utf-8', 'replace')
+            log(f"Error fetching transcripts, exit code: {result.returncode}")
+            log(f"Error details: {stderr_text}")
+            print(f"Error fetching transcripts: {stderr_text}")
+            return False
+
+        return True
+
+    except Exception as e:
+        log_exception("Exception in fetch_transcripts_to_file: %s", str(e))
+        print(f"Error saving transcripts to file: {e}")
+        return False
+
 def fetch_transcripts(assistant_id: str, api_key: str, 
                   min_duration: int = 0, days_ago: int = None, 
                   limit: int = None, today_only: bool = False) -> Optional[str]:
@@ -454,275 +756,35 @@ def fetch_transcripts(assistant_id: str, api_key: str,
     """
     log(f"Fetching transcripts for assistant ID: {assistant_id}")
     log(f"Filters: min_duration={min_duration}, days_ago={days_ago}, limit={limit}, today_only={today_only}")
-    
-    # Create a temporary Python script to execute in the virtual environment
-    temp_script = os.path.join(SCRIPT_DIR, "_temp_fetch.py")
-    log(f"Creating temporary script: {temp_script}")
-    
+
+    command = _build_fetch_command(assistant_id, min_duration=min_duration,
+                                   days_ago=days_ago, limit=limit,
+                                   today_only=today_only)
+
     try:
-        # Write the script content directly to avoid f-string issues
-        script_content = '''
-import sys
-import traceback
-from vapi import Vapi
-from datetime import datetime, timedelta
+        log(f"Running fetcher: {' '.join(command)}")
+        # The API key travels via the environment, keeping it off the
+        # command line and out of any file
+        # Capture in binary and decode once, instead of letting
+        # text-mode decode line by line
+        result = subprocess.run(command, capture_output=True,
+                                cwd=SCRIPT_DIR,
+                                env={**os.environ, 'VAPI_API_KEY': api_key})
 
-try:
-    # Initialize VAPI client
-    client = Vapi(token="API_KEY_PLACEHOLDER")
-    
-    # Fetch calls
-    response = client.calls.list(assistant_id="ASSISTANT_ID_PLACEHOLDER")
-    calls = list(response)
-    
-    if not calls:
-        print("No calls found")
-        sys.exit(0)
-    
-    # Sort calls by creation date (oldest first)
-    # First try to convert to datetime objects for proper sorting
-    def get_created_date(call):
-        created_at = getattr(call, "created_at", None) or getattr(call, "createdAt", None)
-        if hasattr(created_at, 'timestamp'):  # It's already a datetime object
-            return created_at.timestamp()
-        elif isinstance(created_at, str):
-            try:
-                # Try to parse the ISO date string
-                date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                return date_obj.timestamp()
-            except (ValueError, TypeError):
-                pass
-        # Fallback to string comparison if date parsing fails
-        return str(created_at) if created_at else ""
-    
-    sorted_calls = sorted(calls, key=get_created_date)
-    
-    # Apply filters
-    filtered_calls = []
-    min_duration = MIN_DURATION_PLACEHOLDER  # Minimum duration in seconds
-    days_ago = DAYS_AGO_PLACEHOLDER  # Only include calls from the last N days
-    today_only = TODAY_ONLY_PLACEHOLDER  # Only include calls from today
-    
-    # Calculate the cutoff date for filtering
-    now = datetime.now()
-    if days_ago is not None and days_ago > 0:
-        cutoff_date = now - timedelta(days=days_ago)
-    elif today_only:
-        cutoff_date = datetime(now.year, now.month, now.day, 0, 0, 0)
-    else:
-        cutoff_date = None
-    
-    for call in sorted_calls:
-        # Check duration
-        duration = getattr(call, "duration", 0) or 0
-        
-        # Skip if duration is less than minimum
-        if duration < min_duration:
-            continue
-            
-        # Check if the call is within the date range
-        if cutoff_date:
-            created_at = getattr(call, "created_at", None) or getattr(call, "createdAt", None)
-            call_datetime = None
-            
-            if hasattr(created_at, 'timestamp'):  # It's already a datetime object
-                call_datetime = created_at
-            elif isinstance(created_at, str):
-                try:
-                    # Try to parse the ISO date string
-                    call_datetime = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                except (ValueError, TypeError):
-                    pass
-                    
-            if call_datetime and call_datetime < cutoff_date:
-                continue
-                
-        filtered_calls.append(call)
-    
-    # Apply limit if specified
-    limit = LIMIT_PLACEHOLDER  # Maximum number of calls to include
-    if limit is not None and limit > 0 and len(filtered_calls) > limit:
-        filtered_calls = filtered_calls[-limit:]  # Take the most recent calls
-    
-    if not filtered_calls:
-        print("No calls match the specified filters")
-        sys.exit(0)
-    
-    # Add header with total call count
-    result = f"# VAPI Call Transcripts ({len(filtered_calls)} total calls)\\n\\n"
-    result += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n\\n"
-    
-    for i, call in enumerate(filtered_calls):
-        call_id = getattr(call, "id", "unknown")
-        
-        # Get the dates (created_at and ended_at)
-        try:
-            created_at = getattr(call, "created_at", None) or getattr(call, "createdAt", None)
-            if hasattr(created_at, 'strftime'):  # It's already a datetime object
-                call_start_date = created_at.strftime('%Y-%m-%d %H:%M:%S')
-            elif isinstance(created_at, str):
-                call_start_date = datetime.fromisoformat(created_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                call_start_date = "Unknown date"
-        except (ValueError, TypeError, AttributeError) as e:
-            call_start_date = "Unknown date"
-            
-        try:
-            ended_at = getattr(call, "ended_at", None) or getattr(call, "endedAt", None)
-            if hasattr(ended_at, 'strftime'):  # It's already a datetime object
-                call_end_date = ended_at.strftime('%Y-%m-%d %H:%M:%S')
-            elif isinstance(ended_at, str):
-                call_end_date = datetime.fromisoformat(ended_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                call_end_date = "Unknown end time"
-        except (ValueError, TypeError, AttributeError) as e:
-            call_end_date = "Unknown end time"
-        
-        # Get duration (calculated or from attribute)
-        duration = getattr(call, "duration", 0)
-        if not duration and call_start_date != "Unknown date" and call_end_date != "Unknown end time":
-            try:
-                # Try to calculate duration
-                start_dt = datetime.strptime(call_start_date, '%Y-%m-%d %H:%M:%S')
-                end_dt = datetime.strptime(call_end_date, '%Y-%m-%d %H:%M:%S')
-                duration = (end_dt - start_dt).total_seconds()
-            except:
-                duration = 0
-                
-        duration_str = f" ({duration:.0f}s)" if duration else ""
-        
-        # Get additional metadata
-        status = getattr(call, "status", "")
-        ended_reason = getattr(call, "ended_reason", "")
-        call_type = getattr(call, "type", "")
-        status_info = f" • Status: {status}" if status else ""
-        reason_info = f" • Ended: {ended_reason}" if ended_reason else ""
-        type_info = f" • Type: {call_type}" if call_type else ""
-        
-        # Format header with metadata
-        result += f"# Call {i+1} - {call_start_date}{duration_str} (ID: {call_id})\\n"
-        result += f"Start: {call_start_date} • End: {call_end_date}{status_info}{reason_info}{type_info}\\n\\n"
-        
-        # Check for transcript in the artifact first - this is the most reliable source
-        artifact = getattr(call, "artifact", None)
-        transcript_found = False
-        
-        if artifact:
-            # Try to get the pre-formatted transcript from the artifact
-            artifact_transcript = getattr(artifact, "transcript", None)
-            if artifact_transcript and isinstance(artifact_transcript, str) and artifact_transcript.strip():
-                transcript_found = True
-                # Clean up the transcript format
-                clean_transcript = artifact_transcript.replace("AI:", "AI: ").replace("User:", "Human: ")
-                result += clean_transcript + "\\n\\n"
-        
-        # If no transcript was found in the artifact, try the messages
-        if not transcript_found and artifact:
-            messages = getattr(artifact, "messages", [])
-            if messages:
-                transcript_found = True
-                # Sort messages by time
-                sorted_messages = sorted(messages, key=lambda x: getattr(x, "time", 0))
-                
-                for message in sorted_messages:
-                    role = getattr(message, "role", "")
-                    if role == "system":
-                        # Skip system messages
-                        continue
-                    
-                    display_role = "AI" if role == "bot" else "Human"
-                    content = getattr(message, "message", "")
-                    if content and content.strip():
-                        result += f"{display_role}: {content}\\n\\n"
-        
-        # If still no transcript, try other approaches
-        if not transcript_found:
-            # Try direct transcript attribute if available
-            transcript = getattr(call, "transcript", None)
-            if transcript:
-                transcript_found = True
-                # Sort transcript entries by creation time
-                sorted_entries = sorted(transcript, key=lambda x: getattr(x, "createdAt", ""))
-                
-                for entry in sorted_entries:
-                    role = "AI" if getattr(entry, "role", "") == "assistant" else "Human"
-                    content = getattr(entry, "content", "")
-                    if content and content.strip():
-                        result += f"{role}: {content}\\n\\n"
-            
-            # Try the messages attribute directly if still no transcript
-            if not transcript_found:
-                messages = getattr(call, "messages", [])
-                if messages:
-                    transcript_found = True
-                    sorted_messages = sorted(messages, key=lambda x: getattr(x, "createdAt", ""))
-                    
-                    for message in sorted_messages:
-                        role = "AI" if getattr(message, "role", "") == "assistant" else "Human"
-                        content = getattr(message, "content", "")
-                        if content and content.strip():
-                            result += f"{role}: {content}\\n\\n"
-        
-        if not transcript_found:
-            result += "No transcript available for this call\\n\\n"
-        
-        result += "---\\n\\n"
-    
-    print(result)
-except Exception as e:
-    print(f"Error: {e}", file=sys.stderr)
-    print("Traceback:", file=sys.stderr)
-    traceback.print_exc(file=sys.stderr)
-    sys.exit(1)
-'''
-        
-        # Replace placeholders with actual values
-        script_content = script_content.replace("API_KEY_PLACEHOLDER", api_key)
-        script_content = script_content.replace("ASSISTANT_ID_PLACEHOLDER", assistant_id)
-        script_content = script_content.replace("MIN_DURATION_PLACEHOLDER", str(min_duration))
-        script_content = script_content.replace("DAYS_AGO_PLACEHOLDER", "None" if days_ago is None else str(days_ago))
-        script_content = script_content.replace("LIMIT_PLACEHOLDER", "None" if limit is None else str(limit))
-        # Use Python's True/False, not JavaScript's true/false
-        script_content = script_content.replace("TODAY_ONLY_PLACEHOLDER", str(today_only))
-        
-        with open(temp_script, 'w') as f:
-            f.write(script_content)
-            
-        log("Temporary script created")
-        
-        # Execute the temporary script with the virtual environment
-        log("Executing temporary script")
-        result = run_with_venv(f"python {temp_script}")
-        
-        # Clean up
-        try:
-            os.remove(temp_script)
-            log("Temporary script removed")
-        except Exception as e:
-            log(f"Error removing temporary script: {str(e)}")
-        
         if result.returncode != 0:
+            stderr_text = result.stderr.decode('utf-8', 'replace')
             log(f"Error fetching transcripts, exit code: {result.returncode}")
-            log(f"Error details: {result.stderr}")
-            print(f"Error fetching transcripts: {result.stderr}")
+            log(f"Error details: {stderr_text}")
+            print(f"Error fetching transcripts: {stderr_text}")
             return None
-        
-        log(f"Successfully fetched transcripts: {len(result.stdout)} characters")
-        return result.stdout
-        
+
+        transcripts = result.stdout.decode('utf-8', 'replace')
+        log(f"Successfully fetched transcripts: {len(transcripts)} characters")
+        return transcripts
+
     except Exception as e:
-        log(f"Exception in fetch_transcripts: {str(e)}")
-        log(traceback.format_exc())
+        log_exception("Exception in fetch_transcripts: %s", str(e))
         print(f"Error preparing transcript fetch: {e}")
-        
-        # Ensure temp file is cleaned up
-        try:
-            if os.path.exists(temp_script):
-                os.remove(temp_script)
-                log("Cleaned up temporary script after exception")
-        except:
-            pass
-            
         return None
 
 def setup_environment() -> Tuple[bool, Optional[str]]:
@@ -736,8 +798,16 @@ def setup_environment() -> Tuple[bool, Optional[str]]:
     """
     log("Setting up environment")
     
+    # The venv probe may spawn an interpreter; overlap it with the
+    # (trivial) .env read instead of running them back to back
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        venv_future = executor.submit(check_venv_setup)
+        key_future = executor.submit(check_api_key)
+        venv_ok = venv_future.result()
+        api_key = key_future.result()
+
     # Check virtual environment
-    if not check_venv_setup():
+    if not venv_ok:
         error_msg = "Failed to set up virtual environment. Please set it up manually:"
         log(error_msg)
         print(error_msg)
@@ -747,7 +817,6 @@ def setup_environment() -> Tuple[bool, Optional[str]]:
         return False, None
     
     # Check API key
-    api_key = check_api_key()
     if not api_key:
         log("API key not found")
         print("VAPI API key not found. Please create a .env file with VAPI_API_KEY=your_api_key")
@@ -756,6 +825,52 @@ def setup_environment() -> Tuple[bool, Optional[str]]:
     log("Environment setup successful")
     return True, api_key
 
+def _load_cached_assistant() -> Optional[str]:
+    """
+    Return the cached assistant ID when the cache entry is still fresh.
+
+    Returns:
+        Cached assistant ID, or None on a miss, expiry, or any I/O or
+        parse error (a damaged cache behaves like a cold one)
+    """
+    try:
+        with open(_ASSISTANT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if time.time() - entry['ts'] < _ASSISTANT_CACHE_TTL:
+            log(f"Using cached assistant ID from {_ASSISTANT_CACHE_FILE}")
+            return entry['id']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _store_cached_assistant(assistant_id: str) -> None:
+    """
+    Persist the resolved assistant ID for subsequent runs.
+
+    Writes to a temp file and renames into place so a concurrent run
+    never reads a half-written entry.
+
+    Args:
+        assistant_id: The assistant ID to cache
+    """
+    try:
+        cache_dir = os.path.dirname(_ASSISTANT_CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = _ASSISTANT_CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'ts': time.time(), 'id': assistant_id}, f)
+        os.replace(tmp_path, _ASSISTANT_CACHE_FILE)
+    except OSError as e:
+        # The cache is an optimization; never let it break a run
+        log(f"Could not write assistant ID cache: {str(e)}")
+
+def _clear_cached_assistant() -> None:
+    """Drop the cached assistant ID so the next run rescans Chrome"""
+    try:
+        os.remove(_ASSISTANT_CACHE_FILE)
+    except OSError:
+        pass
+
 def find_assistant_id() -> Optional[str]:
     """
     Find a VAPI assistant ID from Chrome tabs.
@@ -766,13 +881,14 @@ def find_assistant_id() -> Optional[str]:
     log("Looking for VAPI assistant tabs")
     print("Looking for VAPI assistant tabs in Chrome...")
     
-    # First check foreground tab
+    # One osascript call fetches the foreground URL and the tab list
+    all_tabs: List[str] = []
     try:
-        foreground_url = get_foreground_tab_url()
+        foreground_url, all_tabs = get_chrome_state()
         if foreground_url:
-            log(f"Foreground tab URL: {foreground_url}")
+            log("Foreground tab URL: %s", foreground_url)
             foreground_assistant_id = extract_assistant_id(foreground_url)
-            log(f"Extracted assistant ID from foreground tab: {foreground_assistant_id}")
+            log("Extracted assistant ID from foreground tab: %s", foreground_assistant_id)
             
             if foreground_assistant_id:
                 print(f"Found assistant ID in foreground tab: {foreground_assistant_id}")
@@ -781,19 +897,23 @@ def find_assistant_id() -> Optional[str]:
             log("Could not get URL from foreground Chrome tab")
             print("Could not access foreground Chrome tab.")
     except Exception as e:
-        log(f"Error getting foreground tab URL: {str(e)}")
-        log(traceback.format_exc())
+        log_exception("Error getting foreground tab URL: %s", str(e))
         print(f"Error accessing Chrome foreground tab: {str(e)}")
     
     # Check all tabs if foreground tab doesn't have an assistant ID
     try:
-        vapi_tabs = find_vapi_tabs()
+        vapi_tabs = find_vapi_tabs(all_tabs)
+        if not vapi_tabs:
+            # The browser-side filter can miss VAPI tabs whose URL
+            # lacks 'vapi'/'dashboard' (e.g. a bare UUID link); rescan
+            # the full unfiltered tab list before giving up
+            vapi_tabs = find_vapi_tabs()
         
         if vapi_tabs:
-            log(f"Found {len(vapi_tabs)} VAPI tabs")
+            log("Found %d VAPI tabs", len(vapi_tabs))
             
             if len(vapi_tabs) > 1:
-                log(f"Multiple VAPI tabs found: {vapi_tabs}")
+                log("Multiple VAPI tabs found: %s", vapi_tabs)
                 print(f"Found {len(vapi_tabs)} VAPI tabs:")
                 for i, (url, aid) in enumerate(vapi_tabs):
                     print(f"{i+1}. {aid} ({url})")
@@ -804,8 +924,7 @@ def find_assistant_id() -> Optional[str]:
             log("No VAPI assistant tabs found")
             print("No VAPI assistant tabs found in Chrome. Please open a VAPI dashboard tab in Chrome.")
     except Exception as e:
-        log(f"Error finding VAPI tabs: {str(e)}")
-        log(traceback.format_exc())
+        log_exception("Error finding VAPI tabs: %s", str(e))
         print(f"Error searching all Chrome tabs: {e}")
     
     # No fallback ID available in open source version
@@ -838,17 +957,50 @@ def process_transcripts(assistant_id: str, api_key: str,
     """
     # Additional validation and cleaning for assistant_id to prevent API errors
     assistant_id = assistant_id.strip().rstrip(',')
-    # Validate UUID format
-    uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-    if not re.match(uuid_pattern, assistant_id):
+    # Validate via the C-implemented uuid parser; comparing against the
+    # canonical form keeps the old strictness (lowercase, hyphenated)
+    try:
+        valid = str(uuid.UUID(assistant_id)) == assistant_id
+    except ValueError:
+        valid = False
+    if not valid:
         error_msg = f"Invalid assistant ID format: {assistant_id}"
         log(error_msg)
         print(error_msg)
         return False
-    log(f"Processing transcripts for assistant ID: {assistant_id}")
-    log(f"Output options: output_file={output_file}, no_paste={no_paste}")
+    log("Processing transcripts for assistant ID: %s", assistant_id)
+    log("Output options: output_file=%s, no_paste=%s", output_file, no_paste)
     print(f"Fetching transcripts for assistant ID: {assistant_id}")
-    
+
+    # File output streams straight from the fetcher to disk; the
+    # document never lives in this process's memory
+    if output_file:
+        try:
+            # Make sure the directory exists; exist_ok collapses the
+            # stat-then-mkdir pair into one race-free call
+            output_dir = os.path.dirname(output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            if not fetch_transcripts_to_file(
+                assistant_id,
+                api_key,
+                output_file,
+                min_duration=min_duration,
+                days_ago=days_ago,
+                limit=limit,
+                today_only=today_only
+            ):
+                return False
+
+            log("Successfully saved transcripts to file: %s", output_file)
+            print(f"Transcripts saved to file: {output_file}")
+            return True
+        except Exception as e:
+            log_exception("Error saving to file: %s", str(e))
+            print(f"Error saving to file: {e}")
+            return False
+
     # Fetch the transcripts with filters
     transcripts = fetch_transcripts(
         assistant_id, 
@@ -866,50 +1018,36 @@ def process_transcripts(assistant_id: str, api_key: str,
         print(error_msg)
         return False
     
-    log(f"Transcript length: {len(transcripts)} characters")
+    log("Transcript length: %d characters", len(transcripts))
     
-    # Save to file if specified
-    if output_file:
-        try:
-            # Make sure the directory exists
-            output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-                
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(transcripts)
-                
-            log(f"Successfully saved transcripts to file: {output_file}")
-            print(f"Transcripts saved to file: {output_file}")
-            return True
-        except Exception as e:
-            log(f"Error saving to file: {str(e)}")
-            log(traceback.format_exc())
-            print(f"Error saving to file: {e}")
-            return False
-    
-    # Otherwise, copy to clipboard and paste
+    # Copy to clipboard (and paste in the same process
+    # where possible)
     try:
-        copy_to_clipboard(transcripts)
-        log("Successfully copied to clipboard")
-        print("Transcripts copied to clipboard!")
-        
-        # Also paste the content at current cursor position if not disabled
-        if not no_paste:
-            paste_success = paste_from_clipboard()
+        if no_paste:
+            copy_to_clipboard(transcripts)
+            log("Successfully copied to clipboard")
+            print("Transcripts copied to clipboard!")
+        else:
+            paste_success = copy_and_paste(transcripts)
+            log("Successfully copied to clipboard")
+            print("Transcripts copied to clipboard!")
             if paste_success:
                 log("Successfully pasted content at cursor position")
             else:
                 log("Failed to paste content at cursor position")
                 print("Note: Could not automatically paste content")
     except Exception as e:
-        log(f"Error copying to clipboard: {str(e)}")
-        log(traceback.format_exc())
+        log_exception("Error copying to clipboard: %s", str(e))
         print(f"Error copying to clipboard: {e}")
         return False
     
     return True
 
+# Raycast-specific command-line markers, folded into one alternation so
+# the joined argv is scanned once instead of four times
+_RAYCAST_CMD_RE = re.compile(
+    r'--enable-source-maps|--npm-global/bin/raycast|node --no-warnings|Script Error')
+
 def is_raycast_environment() -> bool:
     """
     Detect if the script is being run from Raycast.
@@ -917,42 +1055,26 @@ def is_raycast_environment() -> bool:
     Returns:
         True if running in Raycast environment, False otherwise
     """
+    # The env vars are the definitive signal and cost one dict lookup
+    # each, so they go first; the common Raycast path returns here
+    # without touching sys.argv at all
+    if any(var in os.environ for var in ('RAYCAST_APP_NAME',
+                                         'RAYCAST_EXTENSION_ID',
+                                         'RAYCAST_VERSION')):
+        return True
+
     # For this script specifically, always return True if the script name
     # includes 'vapi-tools' since it's designed primarily as a Raycast script
     script_name = os.path.basename(sys.argv[0])
     if script_name.startswith('vapi_transcripts') or script_name.startswith('vapi-transcripts'):
         return True
     
-    # Additional checks for Raycast
-    # Check if any Raycast-specific environment variables are set
-    raycast_env_vars = [
-        'RAYCAST_APP_NAME', 
-        'RAYCAST_EXTENSION_ID',
-        'RAYCAST_VERSION'
-    ]
-    
-    for var in raycast_env_vars:
-        if var in os.environ:
-            return True
-    
     # Check for specific script execution pattern that seems to be causing issues
     if len(sys.argv) > 1 and '--' in sys.argv[1]:
         return True
         
-    # Check for Raycast-specific command line flags
-    raycast_indicators = [
-        '--enable-source-maps',
-        '--npm-global/bin/raycast',
-        'node --no-warnings',
-        'Script Error'
-    ]
-    
-    cmd_line = ' '.join(sys.argv)
-    for indicator in raycast_indicators:
-        if indicator in cmd_line:
-            return True
-    
-    return False
+    # Only now pay for joining argv, and scan it in one pass
+    return _RAYCAST_CMD_RE.search(' '.join(sys.argv)) is not None
 
 def parse_args() -> argparse.Namespace:
     """
@@ -1040,19 +1162,26 @@ def main() -> int:
         
         # Parse command-line arguments
         args = parse_args()
-        log(f"Command-line arguments: {args}")
+        log("Command-line arguments: %s", args)
         
         # Setup environment (venv and API key)
         setup_success, api_key = setup_environment()
         if not setup_success:
             return 1
         
-        # Find or use provided assistant ID
+        # Find or use provided assistant ID. A fresh cache entry skips
+        # the Chrome scan entirely on warm runs.
         assistant_id = args.assistant_id
+        from_cache = False
+        if not assistant_id:
+            assistant_id = _load_cached_assistant()
+            from_cache = assistant_id is not None
         if not assistant_id:
-            log("No assistant ID provided via command line, using hardcoded ID")
+            log("No assistant ID provided via command line, scanning Chrome")
             assistant_id = find_assistant_id()
-            
+            if assistant_id:
+                _store_cached_assistant(assistant_id)
+
         if not assistant_id:
             error_msg = "No assistant ID found"
             log(error_msg)
@@ -1070,14 +1199,17 @@ def main() -> int:
             today_only=args.today,
             no_paste=args.no_paste
         ):
+            # A stale cached ID (deleted assistant, switched dashboard)
+            # must not wedge the tool; drop it so the next run rescans
+            if from_cache:
+                _clear_cached_assistant()
             return 1
         
         log("Execution completed successfully")
         return 0
         
     except Exception as e:
-        log(f"Unhandled error in main function: {str(e)}")
-        log(traceback.format_exc())
+        log_exception("Unhandled error in main function: %s", str(e))
         print(f"An error occurred: {e}")
         return 1
 